@@ -0,0 +1,253 @@
+"""Almacén compartido de conjuntos de datos limpios y de solo lectura.
+
+Cuando varias sesiones de Streamlit abren el mismo archivo, los datos se
+leen, interpolan y resumen una sola vez por proceso. Cada sesión recibe una
+vista superficial (`DataFrame.copy(deep=False)`) que comparte la memoria con
+la copia del almacén; con copy-on-write activado, cualquier modificación de
+una sesión copia solo la columna afectada y nunca altera a las demás.
+
+El almacén cuenta cuántas vistas de cada conjunto siguen vivas. Cuando la
+memoria ocupada supera el límite, se descartan primero los conjuntos sin
+vistas vivas que hace más tiempo no se usan.
+
+Opcionalmente, si se define la variable de entorno `DIRECTORIO_ALMACEN`, los
+conjuntos limpios se guardan como archivos Arrow y se abren con un mapeo de
+memoria, de modo que varios procesos comparten las mismas páginas. Esto
+requiere `pyarrow`. Los conjuntos leídos desde una URL no se guardan en disco:
+su contenido puede cambiar sin que cambie la URL, por lo que su clave vence
+cada `VIGENCIA_URL` segundos y se vuelven a leer.
+
+Los datos precalculados junto con el conjunto (resúmenes estadísticos,
+muestras para vistas previas) se guardan en la misma entrada del almacén y se
+devuelven aparte, no en `DataFrame.attrs`: pandas copia `attrs` en cada vista,
+selección de columnas o filtro.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+import weakref
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # En pandas 3 copy-on-write ya es el comportamiento por defecto.
+    pd.set_option("mode.copy_on_write", True)
+
+MEMORIA_MAXIMA = int(os.environ.get("MEMORIA_ALMACEN_MB", "2048")) * 1024**2
+
+# Segundos que se reutiliza un conjunto leído desde una URL antes de volver a leerlo
+VIGENCIA_URL = int(os.environ.get("VIGENCIA_URL_SEGUNDOS", "600"))
+
+
+def clave_fuente(prefijo, archivo=None, url=None, vigencia=VIGENCIA_URL):
+    """Calcula una clave que identifica el contenido de una fuente de datos.
+
+    Para archivos la clave depende del contenido (o del tamaño y la fecha de
+    modificación). Para una URL no se puede saber sin descargarla, así que la
+    clave incluye el intervalo de `vigencia` segundos en curso: al empezar el
+    siguiente intervalo la URL se vuelve a leer.
+
+    Args:
+        prefijo (str): Nombre de la aplicación o del proceso de limpieza.
+        archivo (str | UploadedFile, optional): Ruta o archivo subido. Defaults to None.
+        url (str, optional): URL del archivo CSV. Defaults to None.
+        vigencia (int, optional): Segundos que vale la clave de una URL. Defaults to VIGENCIA_URL.
+
+    Returns:
+        str: Clave del conjunto de datos.
+    """
+    if archivo is not None and hasattr(archivo, "getvalue"):
+        firma = hashlib.sha256(archivo.getvalue()).hexdigest()
+    elif archivo is not None:
+        info = os.stat(archivo)
+        firma = f"{os.path.abspath(archivo)}:{info.st_size}:{info.st_mtime_ns}"
+    else:
+        firma = f"{url}:{int(time.time() // vigencia)}"
+    return f"{prefijo}-{hashlib.sha256(firma.encode()).hexdigest()[:32]}"
+
+
+def mascara_rangos(df, rangos):
+    """Calcula una máscara booleana de filas dentro de varios rangos cerrados.
+
+    La máscara se acumula en un único arreglo, sin construir un DataFrame
+    filtrado, para que los filtros de cada sesión no copien los datos.
+
+    Args:
+        df (pd.DataFrame): Datos compartidos.
+        rangos (dict): Columna -> (mínimo, máximo).
+
+    Returns:
+        np.ndarray: Arreglo booleano con una posición por fila.
+    """
+    mascara = np.ones(len(df), dtype=bool)
+    for columna, (minimo, maximo) in rangos.items():
+        valores = df[columna].to_numpy()
+        mascara &= valores >= minimo
+        mascara &= valores <= maximo
+    return mascara
+
+
+def _memoria(valor):
+    """Bytes ocupados por un DataFrame o una Serie; cero para otros valores."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return int(np.sum(valor.memory_usage(deep=True)))
+    return 0
+
+
+class Almacen:
+    """Conjuntos de datos inmutables compartidos por todo el proceso.
+
+    Args:
+        memoria_maxima (int, optional): Bytes a partir de los cuales se
+            descartan conjuntos sin vistas vivas. Defaults to MEMORIA_MAXIMA.
+        directorio (str, optional): Carpeta para los archivos Arrow compartidos
+            entre procesos. Defaults to None.
+    """
+
+    def __init__(self, memoria_maxima=MEMORIA_MAXIMA, directorio=None):
+        self.memoria_maxima = memoria_maxima
+        self.directorio = directorio
+        self._entradas = {}
+        self._lock = threading.Lock()
+        self._cargando = {}
+
+    def _ruta_arrow(self, clave):
+        return os.path.join(self.directorio, f"{clave}.arrow")
+
+    def _leer_arrow(self, ruta):
+        import pyarrow as pa
+
+        tabla = pa.ipc.open_file(pa.memory_map(ruta)).read_all()
+        df = tabla.to_pandas(types_mapper=pd.ArrowDtype)
+        extras = {}
+        if os.path.exists(ruta + ".extras"):
+            with open(ruta + ".extras", "rb") as archivo:
+                extras = pickle.load(archivo)
+        return df, extras
+
+    def _escribir_arrow(self, df, extras, ruta):
+        import pyarrow as pa
+
+        os.makedirs(self.directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        tabla = pa.Table.from_pandas(df, preserve_index=True)
+        with pa.OSFile(temporal, "wb") as salida, pa.ipc.new_file(salida, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+        with open(temporal + ".extras", "wb") as archivo:
+            pickle.dump(extras, archivo)
+        os.replace(temporal + ".extras", ruta + ".extras")
+        os.replace(temporal, ruta)
+
+    def _cargar(self, clave, cargar, persistir):
+        """Obtiene el conjunto limpio y sus extras desde Arrow o ejecutando `cargar`."""
+        persistir = persistir and self.directorio is not None
+        if persistir and os.path.exists(self._ruta_arrow(clave)):
+            return self._leer_arrow(self._ruta_arrow(clave))
+        cargado = cargar()
+        df, extras = cargado if isinstance(cargado, tuple) else (cargado, {})
+        if df is not None and persistir:
+            self._escribir_arrow(df, extras, self._ruta_arrow(clave))
+            return self._leer_arrow(self._ruta_arrow(clave))
+        return df, extras
+
+    def _liberar(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                entrada["referencias"] -= 1
+                self._desalojar()
+
+    def _desalojar(self):
+        """Descarta conjuntos sin vistas vivas hasta respetar el límite de memoria."""
+        ocupada = sum(entrada["bytes"] for entrada in self._entradas.values())
+        libres = sorted(
+            (entrada["ultimo_uso"], clave)
+            for clave, entrada in self._entradas.items()
+            if entrada["referencias"] <= 0
+        )
+        for _, clave in libres:
+            if ocupada <= self.memoria_maxima:
+                break
+            ocupada -= self._entradas.pop(clave)["bytes"]
+
+    def obtener(self, clave, cargar, persistir=True):
+        """Devuelve una vista de solo lectura del conjunto identificado por `clave`.
+
+        Si el conjunto no está en el almacén se construye con `cargar`; si
+        varias sesiones lo piden a la vez, solo una ejecuta la carga.
+
+        Args:
+            clave (str): Identificador del conjunto (ver `clave_fuente`).
+            cargar (callable): Función sin argumentos que devuelve el DataFrame
+                limpio, o una tupla (DataFrame, dict) con los datos
+                precalculados que acompañan al conjunto.
+            persistir (bool, optional): Guardar el conjunto como archivo Arrow
+                si hay `directorio`. Debe ser False para fuentes cuyo contenido
+                puede cambiar sin que cambie la clave, como las URL. Defaults to True.
+
+        Returns:
+            tuple: Vista que comparte memoria con el almacén (o None si
+            `cargar` devolvió None) y los datos precalculados, compartidos por
+            todas las sesiones y de solo lectura.
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                evento = self._cargando.get(clave)
+                propio = evento is None
+                if propio:
+                    evento = self._cargando[clave] = threading.Event()
+        if entrada is None:
+            if not propio:
+                evento.wait()
+                return self.obtener(clave, cargar, persistir)
+            try:
+                df, extras = self._cargar(clave, cargar, persistir)
+            finally:
+                with self._lock:
+                    self._cargando.pop(clave).set()
+            if df is None:
+                return None, MappingProxyType({})
+            with self._lock:
+                entrada = self._entradas[clave] = {
+                    "df": df,
+                    "extras": MappingProxyType(dict(extras)),
+                    "bytes": _memoria(df) + sum(_memoria(valor) for valor in extras.values()),
+                    "referencias": 0,
+                    "ultimo_uso": time.monotonic(),
+                }
+
+        with self._lock:
+            entrada["referencias"] += 1
+            entrada["ultimo_uso"] = time.monotonic()
+            vista = entrada["df"].copy(deep=False)
+            self._desalojar()
+        weakref.finalize(vista, self._liberar, clave)
+        return vista, entrada["extras"]
+
+    def estado(self):
+        """Resumen de los conjuntos almacenados.
+
+        Returns:
+            pd.DataFrame: Filas, memoria y vistas vivas por conjunto.
+        """
+        with self._lock:
+            return pd.DataFrame(
+                [
+                    {
+                        "clave": clave,
+                        "filas": len(entrada["df"]),
+                        "megabytes": entrada["bytes"] / 1024**2,
+                        "vistas": entrada["referencias"],
+                    }
+                    for clave, entrada in self._entradas.items()
+                ]
+            )
+
+
+ALMACEN = Almacen(directorio=os.environ.get("DIRECTORIO_ALMACEN"))
@@ -1,9 +1,23 @@
+from functools import partial
+
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.stats as stats
+
+from almacen import ALMACEN, clave_fuente
+from correlaciones import correlaciones, figura_correlaciones
+from graficos_arqueologia import (
+    ESTRATOS,
+    figura_artefactos_por_cultura,
+    figura_artefactos_por_pais,
+    figura_edad_profundidad,
+    figura_mapa_artefactos,
+    figura_materiales_por_cultura,
+    figura_patrones_por_cultura,
+    figura_tendencia_anual,
+    limpiar_datos,
+)
+from progresivo import muestra_estratificada, mostrar_progresivo, pagina_progresiva
 
 # Configuración de la app
 st.set_page_config(page_title="Mi primera app", layout="wide")
@@ -18,162 +32,130 @@ url = (
     "programacion-para-ingenieria/refs/heads/main/"
     "archivos-datos/aplicaciones/datos_arqueologicos.csv"
 )
-df = pd.read_csv(url)
-
-# Interpolación de columnas numéricas
-df["Edad_Aprox_Anios"] = df["Edad_Aprox_Anios"].interpolate(
-    method="linear", limit_direction="both"
-)
-df["Profundidad_Excavación_m"] = df["Profundidad_Excavación_m"].interpolate(
-    method="linear", limit_direction="both"
-)
-
-# Interpolación de columnas categóricas (rellenar con la moda)
-df["Nombre_Artefacto"] = df["Nombre_Artefacto"].fillna(
-    df["Nombre_Artefacto"].mode().iloc[0]
-)
-df["Ubicación_Descubrimiento"] = df["Ubicación_Descubrimiento"].fillna(
-    df["Ubicación_Descubrimiento"].mode().iloc[0]
-)
-df["Investigador_Principal"] = df["Investigador_Principal"].fillna(
-    df["Investigador_Principal"].mode().iloc[0]
-)
-
-# Interpolación de fechas
-df["Fecha_Descubrimiento"] = pd.to_datetime(
-    df["Fecha_Descubrimiento"], errors="coerce"
-)
-df["Fecha_Descubrimiento"] = df["Fecha_Descubrimiento"].fillna(method="ffill")
-
-# Mostrar valores nulos después de la interpolación
-st.write("### Valores nulos después de la interpolación:")
-st.dataframe(df.isnull().sum())
-
-# 🔹 Gráfico de cantidad de artefactos por cultura
-st.write("## Cantidad de Artefactos por Cultura")
-conteo_culturas = df["Cultura_Asociada"].value_counts()
-
-fig, ax = plt.subplots(figsize=(12, 6))
-conteo_culturas.plot(kind="bar", color="skyblue", edgecolor="black", ax=ax)
 
-ax.set_xlabel("Cultura")
-ax.set_ylabel("Cantidad de Artefactos")
-ax.set_title("Cantidad de Artefactos por Cultura")
-ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
 
-st.pyplot(fig)
+@st.cache_data(show_spinner=False)
+def matriz_correlaciones(clave, metodo, _df):
+    """Matriz de correlación de las columnas numéricas, guardada entre ejecuciones.
 
-# 🔹 Gráfico de dispersión: Relación entre Edad y Profundidad
-st.write("## Relación entre Edad y Profundidad del Artefacto")
+    Args:
+        clave (str): Identificador del conjunto de datos (ver `clave_fuente`).
+        metodo (str): "pearson" o "spearman".
+        _df (pd.DataFrame): Datos; no forma parte de la clave de la caché.
 
-datos_filtrados = df.dropna(subset=["Edad_Aprox_Anios", "Profundidad_Excavación_m"])
-if not datos_filtrados.empty:
-    correlacion, p_valor = stats.pearsonr(
-        datos_filtrados["Edad_Aprox_Anios"], datos_filtrados["Profundidad_Excavación_m"]
-    )
+    Returns:
+        Correlaciones: Coeficientes, p-valores y conteos.
+    """
+    return correlaciones(_df, metodo=metodo)
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.scatter(
-        datos_filtrados["Edad_Aprox_Anios"],
-        datos_filtrados["Profundidad_Excavación_m"],
-        alpha=0.6,
-        color="royalblue",
-    )
 
-    ax.set_xlabel("Edad Aproximada del Artefacto (años)")
-    ax.set_ylabel("Profundidad del Hallazgo (metros)")
-    ax.set_title(
-        f"Relación entre Edad y Profundidad\nCorrelación de Pearson: {correlacion:.2f}"
-    )
+def figura_matriz(metodo, resultado, completo):
+    """Mapa de calor de la matriz de correlación para `mostrar_progresivo`.
 
-    st.pyplot(fig)
+    Args:
+        metodo (str): "pearson" o "spearman".
+        resultado (Correlaciones): Matriz guardada del conjunto completo.
+        completo (pd.DataFrame): Conjunto completo al que corresponde `resultado`.
 
-    st.write(f"**Correlación de Pearson:** {correlacion:.2f}")
-    st.write(f"**P-valor:** {p_valor:.5f}")
-else:
-    st.warning("No hay suficientes datos válidos para calcular la correlación.")
+    Returns:
+        callable: Recibe los datos y devuelve la figura; para la vista previa
+        calcula la matriz de la muestra.
+    """
+    def construir(datos):
+        matriz = resultado if datos is completo else correlaciones(datos, metodo=metodo)
+        return figura_correlaciones(matriz, f"Correlación de {metodo.capitalize()}")
 
-# 🔹 Gráfico de barras apiladas: Distribución de Materiales según Cultura Asociada
-st.write("## Distribución de Materiales según la Cultura Asociada")
+    return construir
 
-datos_filtrados = df.dropna(subset=["Cultura_Asociada", "Material"])
-conteo_materiales = datos_filtrados.groupby(["Cultura_Asociada", "Material"]).size().unstack(fill_value=0)
 
-fig, ax = plt.subplots(figsize=(12, 6))
-conteo_materiales.plot(kind="bar", stacked=True, ax=ax, colormap="viridis")
+def leer_y_limpiar():
+    # Interpolación de todas las columnas en una sola pasada:
+    # numéricas lineales, categóricas con la moda y fechas hacia adelante
+    df = limpiar_datos(pd.read_csv(url))
 
-ax.set_xlabel("Cultura Asociada")
-ax.set_ylabel("Cantidad de Artefactos")
-ax.set_title("Distribución de Materiales según la Cultura Asociada")
-ax.legend(title="Material", bbox_to_anchor=(1.05, 1), loc="upper left")
+    # Muestra para las vistas previas, compartida por todos los gráficos
+    return df, {"muestra": muestra_estratificada(df, ESTRATOS)}
 
-st.pyplot(fig)
 
-# 🔹 Mapa de ubicación geográfica de los artefactos
-st.write("## Ubicación Geográfica de los Artefactos")
+# Datos limpios compartidos por todas las sesiones; al venir de una URL se
+# vuelven a leer cuando vence su clave y no se guardan en disco
+clave = clave_fuente("arqueologia", url=url)
+df, extras = ALMACEN.obtener(clave, leer_y_limpiar, persistir=False)
+muestra = extras["muestra"]
 
-naturalearth_lowres = (
-    "https://naciscdn.org/naturalearth/110m/"
-    "cultural/ne_110m_admin_0_countries.zip"
-)
-gdf = gpd.read_file(naturalearth_lowres)
-
-fig, ax = plt.subplots(figsize=(12, 8))
-gdf.plot(ax=ax, color="lightgray", edgecolor="black")
-
-df_coordenadas = df.dropna(subset=["Latitud", "Longitud"])
-if not df_coordenadas.empty:
-    ax.scatter(
-        df_coordenadas["Longitud"],
-        df_coordenadas["Latitud"],
-        c="red",
-        marker="o",
-        alpha=0.7,
-        label="Artefactos",
-    )
-
-    ax.set_title("Ubicación Geográfica de los Artefactos")
-    ax.set_xlabel("Longitud")
-    ax.set_ylabel("Latitud")
-    ax.legend()
-    ax.grid(True)
-
-    st.pyplot(fig)
-else:
-    st.warning("No hay suficientes datos con coordenadas para graficar el mapa.")
-
-# 🔹 Gráfico de Patrones Decorativos por Cultura
-st.write("## Patrones Decorativos por Cultura")
-
-patrones_por_cultura = df.groupby(["Cultura_Asociada", "Patrones_Decorativos"]).size().unstack()
-
-fig, ax = plt.subplots(figsize=(12, 6))
-patrones_por_cultura.plot(kind="bar", stacked=True, ax=ax, colormap="viridis")
-
-ax.set_xlabel("Cultura Asociada")
-ax.set_ylabel("Cantidad de Artefactos")
-ax.set_title("Patrones Decorativos por Cultura")
-ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
-ax.legend(title="Patrones Decorativos", bbox_to_anchor=(1.05, 1), loc="upper left")
-ax.grid(axis="y", linestyle="--", alpha=0.7)
-
-st.pyplot(fig)
-
-# 🔹 Gráfico de Tendencia de Descubrimientos por Año
-st.write("## Tendencia de Descubrimientos por Año")
-
-df["Fecha_Descubrimiento"] = pd.to_datetime(df["Fecha_Descubrimiento"], errors="coerce")
-hallazgos_por_anio = df["Fecha_Descubrimiento"].dt.year.value_counts().sort_index()
-
-fig, ax = plt.subplots(figsize=(12, 6))
-ax.plot(hallazgos_por_anio.index, hallazgos_por_anio.values, marker="o", linestyle="-", color="b")
-
-ax.set_xlabel("Año de Descubrimiento")
-ax.set_ylabel("Cantidad de Artefactos")
-ax.set_title("Tendencia de Descubrimientos por Año")
-ax.grid(axis="y", linestyle="--", alpha=0.7)
+# Mostrar valores nulos después de la interpolación
+st.write("### Valores nulos después de la interpolación:")
+st.dataframe(df.isnull().sum())
 
-st.pyplot(fig)
+# Todos los gráficos comparten el presupuesto de la vista previa; los
+# exactos reemplazan a las vistas previas a medida que terminan
+with pagina_progresiva():
+    # 🔹 Gráfico de cantidad de artefactos por cultura
+    st.write("## Cantidad de Artefactos por Cultura")
+    mostrar_progresivo(figura_artefactos_por_cultura, df, estratos=ESTRATOS, muestra=muestra)
+
+    # 🔹 Gráfico de dispersión: Relación entre Edad y Profundidad
+    st.write("## Relación entre Edad y Profundidad del Artefacto")
+
+    # Matrices de correlación de todas las columnas numéricas en una sola
+    # pasada, calculadas una sola vez por conjunto de datos
+    pearson = matriz_correlaciones(clave, "pearson", df)
+    spearman = matriz_correlaciones(clave, "spearman", df)
+
+    datos_filtrados = df.dropna(subset=["Edad_Aprox_Anios", "Profundidad_Excavación_m"])
+    if not datos_filtrados.empty:
+        correlacion = pearson.r.loc["Edad_Aprox_Anios", "Profundidad_Excavación_m"]
+        p_valor = pearson.p_valor.loc["Edad_Aprox_Anios", "Profundidad_Excavación_m"]
+
+        mostrar_progresivo(
+            partial(figura_edad_profundidad, correlacion=correlacion),
+            datos_filtrados,
+            estratos=ESTRATOS,
+            muestra=muestra.dropna(subset=["Edad_Aprox_Anios", "Profundidad_Excavación_m"]),
+        )
+
+        st.write(f"**Correlación de Pearson:** {correlacion:.2f}")
+        st.write(f"**P-valor:** {p_valor:.5f}")
+    else:
+        st.warning("No hay suficientes datos válidos para calcular la correlación.")
+
+    # 🔹 Matrices de correlación agrupadas por similitud
+    st.write("## Correlaciones entre Variables Numéricas")
+    st.caption("Las celdas atenuadas no son significativas (p ≥ 0.05).")
+    pestana_pearson, pestana_spearman = st.tabs(["Pearson", "Spearman"])
+    with pestana_pearson:
+        mostrar_progresivo(figura_matriz("pearson", pearson, df), df, estratos=ESTRATOS, muestra=muestra)
+        st.dataframe(pearson.r.round(2))
+    with pestana_spearman:
+        mostrar_progresivo(figura_matriz("spearman", spearman, df), df, estratos=ESTRATOS, muestra=muestra)
+        st.dataframe(spearman.r.round(2))
+
+    # 🔹 Gráfico de barras apiladas: Distribución de Materiales según Cultura Asociada
+    st.write("## Distribución de Materiales según la Cultura Asociada")
+    mostrar_progresivo(figura_materiales_por_cultura, df, estratos=ESTRATOS, muestra=muestra)
+
+    # 🔹 Mapa de ubicación geográfica de los artefactos
+    st.write("## Ubicación Geográfica de los Artefactos")
+
+    df_coordenadas = df.dropna(subset=["Latitud", "Longitud"])
+    muestra_coordenadas = muestra.dropna(subset=["Latitud", "Longitud"])
+    if not df_coordenadas.empty:
+        mostrar_progresivo(figura_mapa_artefactos, df_coordenadas, estratos=ESTRATOS, muestra=muestra_coordenadas)
+
+        # 🔹 Mapa de coropletas: cantidad de artefactos por país; el país de cada
+        # punto se calcula en segundo plano y queda guardado para estas coordenadas
+        st.write("## Artefactos por País")
+        mostrar_progresivo(figura_artefactos_por_pais, df_coordenadas, estratos=ESTRATOS, muestra=muestra_coordenadas)
+    else:
+        st.warning("No hay suficientes datos con coordenadas para graficar el mapa.")
+
+    # 🔹 Gráfico de Patrones Decorativos por Cultura
+    st.write("## Patrones Decorativos por Cultura")
+    mostrar_progresivo(figura_patrones_por_cultura, df, estratos=ESTRATOS, muestra=muestra)
+
+    # 🔹 Gráfico de Tendencia de Descubrimientos por Año
+    st.write("## Tendencia de Descubrimientos por Año")
+    mostrar_progresivo(figura_tendencia_anual, df, estratos=ESTRATOS, muestra=muestra)
 
 # Mostrar vista previa de los datos corregidos
 st.write("### Vista previa de los datos corregidos:")
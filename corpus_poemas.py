@@ -0,0 +1,183 @@
+"""Índice de palabras para generar poemas en lote a partir de textos grandes.
+
+El texto se tokeniza una sola vez. Cada palabra distinta se guarda una vez en
+el vocabulario y las apariciones se representan con identificadores enteros
+compactos, agrupados en dos conjuntos:
+
+- "mayusculas": palabras que empiezan con mayúscula y siguen en minúsculas.
+- "terminadas": palabras que terminan en "o" o "a".
+
+Dentro de cada conjunto los identificadores se ordenan por número de sílabas,
+de modo que restringir un verso a palabras de n sílabas es tomar un tramo del
+arreglo. Generar un poema solo requiere unos pocos índices aleatorios, así que
+su costo no depende del tamaño del texto.
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+PATRON_PALABRA = re.compile(r"\b\w+\b")
+PATRON_MAYUSCULA = r"^[A-ZÁÉÍÓÚÑÜ][a-záéíóúñü]*$"
+PATRON_TERMINADA = r"^\w+[oa]$"
+
+PLANTILLA = (
+    "El viento susurra sobre {m0}.\n"
+    "{t0} florecen a la luz de la luna.\n"
+    "¿Quién puede comprender el suspiro de {t1}?\n"
+    "La sombra de {m1} danza en el atardecer.\n"
+    "Y así, {t2} van cayendo como estrellas perdidas."
+)
+
+# vocabulario: np.ndarray de textos con cada palabra distinta.
+# silabas: np.ndarray con las sílabas aproximadas de cada palabra del vocabulario.
+# conjuntos: nombre -> (identificadores ordenados por sílabas, desplazamientos
+#   donde empieza cada cantidad de sílabas).
+IndicePoemas = namedtuple("IndicePoemas", ["vocabulario", "silabas", "conjuntos"])
+
+CONJUNTOS = {"mayusculas": PATRON_MAYUSCULA, "terminadas": PATRON_TERMINADA}
+
+
+def contar_silabas(palabras):
+    """Cuenta de forma aproximada las sílabas de palabras en español.
+
+    Se cuentan los grupos de vocales y se suma uno por cada hiato (dos vocales
+    fuertes seguidas o una vocal débil acentuada junto a otra vocal).
+
+    Args:
+        palabras (pd.Series): Palabras a analizar.
+
+    Returns:
+        np.ndarray: Número de sílabas de cada palabra (al menos 1).
+    """
+    minusculas = palabras.str.lower()
+    grupos = minusculas.str.count(r"[aeiouáéíóúü]+")
+    hiatos = minusculas.str.count(r"[aeoáéó](?=[aeoáéó])")
+    hiatos += minusculas.str.count(r"[íú](?=[aeiouáéó])|(?<=[aeiouáéó])[íú]")
+    return np.maximum(grupos + hiatos, 1).to_numpy(dtype=np.int16)
+
+
+def _conjunto(codigos, silabas):
+    """Ordena los identificadores por sílabas y calcula los desplazamientos."""
+    orden = np.argsort(silabas[codigos], kind="stable")
+    ordenados = codigos[orden].astype(np.int32)
+    limite = int(silabas.max()) + 2 if len(silabas) else 2
+    desplazamientos = np.searchsorted(silabas[ordenados], np.arange(limite)).astype(np.int64)
+    return ordenados, desplazamientos
+
+
+def construir_indice(texto):
+    """Tokeniza un texto una sola vez y construye el índice de palabras.
+
+    Args:
+        texto (str): Texto de entrada (puede ser un libro completo).
+
+    Returns:
+        IndicePoemas: Índice listo para generar poemas.
+    """
+    codigos, vocabulario = pd.factorize(pd.Series(PATRON_PALABRA.findall(texto), dtype=object))
+    palabras = pd.Series(vocabulario, dtype=object)
+    silabas = contar_silabas(palabras) if len(palabras) else np.empty(0, dtype=np.int16)
+    conjuntos = {}
+    for nombre, patron in CONJUNTOS.items():
+        pertenece = palabras.str.match(patron).to_numpy(dtype=bool) if len(palabras) else np.empty(0, dtype=bool)
+        conjuntos[nombre] = _conjunto(codigos[pertenece[codigos]], silabas)
+    return IndicePoemas(np.asarray(vocabulario, dtype=object), silabas, conjuntos)
+
+
+def guardar_indice(indice, destino):
+    """Guarda el índice en formato .npz comprimido.
+
+    Args:
+        indice (IndicePoemas): Índice a guardar.
+        destino (str | file-like): Ruta o archivo binario de destino.
+    """
+    arreglos = {
+        "vocabulario": np.array("\n".join(indice.vocabulario)),
+        "silabas": indice.silabas,
+    }
+    for nombre, (identificadores, desplazamientos) in indice.conjuntos.items():
+        arreglos[f"{nombre}_identificadores"] = identificadores
+        arreglos[f"{nombre}_desplazamientos"] = desplazamientos
+    np.savez_compressed(destino, **arreglos)
+
+
+def cargar_indice(origen):
+    """Carga un índice guardado con `guardar_indice`.
+
+    Args:
+        origen (str | file-like): Ruta o archivo binario .npz.
+
+    Returns:
+        IndicePoemas: Índice cargado.
+    """
+    with np.load(origen, allow_pickle=False) as datos:
+        texto = str(datos["vocabulario"])
+        vocabulario = np.array(texto.split("\n") if texto else [], dtype=object)
+        conjuntos = {
+            nombre: (datos[f"{nombre}_identificadores"], datos[f"{nombre}_desplazamientos"])
+            for nombre in CONJUNTOS
+        }
+        return IndicePoemas(vocabulario, datos["silabas"], conjuntos)
+
+
+def _candidatos(indice, nombre, silabas):
+    """Identificadores del conjunto, opcionalmente solo los de `silabas` sílabas."""
+    identificadores, desplazamientos = indice.conjuntos[nombre]
+    if silabas is None:
+        return identificadores
+    if silabas + 1 >= len(desplazamientos):
+        return identificadores[:0]
+    return identificadores[desplazamientos[silabas]: desplazamientos[silabas + 1]]
+
+
+def generar_poemas(indice, cantidad, semilla=None, silabas=None, lote=1_000):
+    """Genera poemas aleatorios a partir del índice.
+
+    Args:
+        indice (IndicePoemas): Índice de palabras.
+        cantidad (int): Número de poemas a generar.
+        semilla (int, optional): Semilla para obtener resultados reproducibles. Defaults to None.
+        silabas (int, optional): Usar solo palabras con este número de sílabas. Defaults to None.
+        lote (int, optional): Poemas sorteados por cada llamada al generador aleatorio. Defaults to 1_000.
+
+    Yields:
+        str: Un poema por iteración.
+
+    Raises:
+        ValueError: Si no hay palabras con mayúscula inicial o terminadas en "o"/"a".
+    """
+    mayusculas = _candidatos(indice, "mayusculas", silabas)
+    terminadas = _candidatos(indice, "terminadas", silabas)
+    if not len(mayusculas):
+        raise ValueError("El texto no tiene palabras que empiecen con mayúscula.")
+    if not len(terminadas):
+        raise ValueError('El texto no tiene palabras terminadas en "o" o "a".')
+
+    rng = np.random.default_rng(semilla)
+    for inicio in range(0, cantidad, lote):
+        # Siempre se sortea un lote completo para que la misma semilla produzca
+        # los mismos primeros poemas sin importar la cantidad pedida.
+        tamano = min(lote, cantidad - inicio)
+        sorteo_m = rng.integers(len(mayusculas), size=(lote, 2))[:tamano]
+        sorteo_t = rng.integers(len(terminadas), size=(lote, 3))[:tamano]
+        palabras_m = indice.vocabulario[mayusculas[sorteo_m]]
+        palabras_t = indice.vocabulario[terminadas[sorteo_t]]
+        for (m0, m1), (t0, t1, t2) in zip(palabras_m, palabras_t):
+            yield PLANTILLA.format(m0=m0, m1=m1, t0=t0, t1=t1, t2=t2)
+
+
+def escribir_poemas(indice, cantidad, destino, semilla=None, silabas=None):
+    """Escribe poemas en un archivo de texto a medida que se generan.
+
+    Args:
+        indice (IndicePoemas): Índice de palabras.
+        cantidad (int): Número de poemas.
+        destino (file-like): Archivo de texto abierto para escritura.
+        semilla (int, optional): Semilla del generador aleatorio. Defaults to None.
+        silabas (int, optional): Usar solo palabras con este número de sílabas. Defaults to None.
+    """
+    for numero, poema in enumerate(generar_poemas(indice, cantidad, semilla, silabas), start=1):
+        destino.write(f"--- Poema {numero} ---\n{poema}\n\n")
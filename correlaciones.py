@@ -0,0 +1,292 @@
+"""Matrices de correlación de Pearson y Spearman con p-valores.
+
+Todas las correlaciones entre columnas numéricas se obtienen a la vez con
+productos de matrices sobre bloques de filas, en lugar de llamar a
+`scipy.stats.pearsonr` par por par. Los nulos se descartan por pares: cada
+coeficiente usa solo las filas en las que ambas columnas tienen valor.
+
+Cada bloque se resume con matrices de conteos, medias y sumas de cuadrados y
+productos centrados, que se combinan con la fórmula de Chan et al. Así los
+momentos se pueden actualizar con filas nuevas o combinar entre archivos y
+procesos sin volver a recorrer los datos.
+
+Spearman es Pearson sobre los rangos. En memoria se usan los rangos exactos
+de cada columna; al leer un CSV por bloques se usan los rangos aproximados
+del sketch de cuantiles de `estadisticas`. En ambos casos cada columna se
+ordena una sola vez (no por cada par), de modo que con nulos el resultado
+puede diferir levemente de `scipy.stats.spearmanr` sobre los pares completos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from scipy import stats
+from scipy.cluster import hierarchy
+from scipy.spatial.distance import squareform
+
+from estadisticas import resumir_csv
+
+# r: coeficientes; p_valor: prueba t de r = 0; n: filas completas de cada par.
+Correlaciones = namedtuple("Correlaciones", ["r", "p_valor", "n"])
+
+
+class MomentosCruzados:
+    """Momentos por pares de varias columnas, actualizables por bloques.
+
+    Para cada par (i, j) se guardan el número de filas en las que ambas
+    columnas tienen valor, la media de la columna i sobre esas filas y las
+    sumas de cuadrados y productos centrados.
+
+    Args:
+        columnas (list): Nombres de las columnas, en orden.
+    """
+
+    def __init__(self, columnas):
+        self.columnas = list(columnas)
+        k = len(self.columnas)
+        self.n = np.zeros((k, k))
+        self._media = np.zeros((k, k))
+        self._cuadrados = np.zeros((k, k))
+        self._productos = np.zeros((k, k))
+
+    def _combinar_momentos(self, n, media, cuadrados, productos):
+        total = self.n + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            peso = np.where(total > 0, n / total, 0.0)
+            cruce = np.where(total > 0, self.n * n / total, 0.0)
+        delta = media - self._media
+        self._media += delta * peso
+        self._cuadrados += cuadrados + delta**2 * cruce
+        self._productos += productos + delta * delta.T * cruce
+        self.n = total
+
+    def actualizar(self, bloque):
+        """Incorpora un bloque de filas; los nulos se descartan por pares.
+
+        Args:
+            bloque (pd.DataFrame | np.ndarray): Valores con las columnas en el
+                mismo orden que `columnas`.
+        """
+        if isinstance(bloque, pd.DataFrame):
+            bloque = bloque[self.columnas].apply(pd.to_numeric, errors="coerce")
+        valores = np.asarray(bloque, dtype=float)
+        if not len(valores):
+            return
+        validos = ~np.isnan(valores)
+        # Centrar por la media del bloque reduce la cancelación numérica.
+        with np.errstate(invalid="ignore"):
+            centro = np.nan_to_num(np.nanmean(np.where(validos, valores, np.nan), axis=0))
+        x = np.where(validos, valores - centro, 0.0)
+        m = validos.astype(float)
+
+        n = m.T @ m
+        sumas = x.T @ m
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media_centrada = np.where(n > 0, sumas / n, 0.0)
+        cuadrados = (x * x).T @ m - sumas * media_centrada
+        productos = x.T @ x - sumas * media_centrada.T
+        self._combinar_momentos(n, media_centrada + centro[:, None], cuadrados, productos)
+
+    def combinar(self, otro):
+        """Incorpora los momentos de otras filas con las mismas columnas.
+
+        Args:
+            otro (MomentosCruzados): Momentos a combinar.
+        """
+        if otro.columnas != self.columnas:
+            raise ValueError("Los momentos a combinar deben tener las mismas columnas.")
+        self._combinar_momentos(otro.n, otro._media, otro._cuadrados, otro._productos)
+
+    def correlaciones(self):
+        """Calcula la matriz de correlación y sus p-valores.
+
+        Returns:
+            Correlaciones: Coeficientes, p-valores y conteos como DataFrames.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self._productos / np.sqrt(self._cuadrados * self._cuadrados.T)
+        r = np.clip(r, -1.0, 1.0)
+        return Correlaciones(
+            *(
+                pd.DataFrame(matriz, index=self.columnas, columns=self.columnas)
+                for matriz in (r, p_valores(r, self.n), self.n.astype(np.int64))
+            )
+        )
+
+
+def rangos(valores):
+    """Rangos promedio de una columna, conservando los nulos.
+
+    Equivale a `pd.Series.rank()` pero con un único ordenamiento de NumPy.
+
+    Args:
+        valores (np.ndarray): Valores de una columna.
+
+    Returns:
+        np.ndarray: Rango de cada valor (desde 1); los empates reciben el promedio.
+    """
+    resultado = np.full(len(valores), np.nan)
+    validos = ~np.isnan(valores)
+    presentes = valores[validos]
+    orden = np.argsort(presentes)
+    ordenados = presentes[orden]
+    nuevos = np.ones(len(ordenados), dtype=bool)
+    np.not_equal(ordenados[1:], ordenados[:-1], out=nuevos[1:])
+    inicios = np.flatnonzero(nuevos)
+    fines = np.append(inicios[1:], len(ordenados))
+    rango = np.empty(len(ordenados))
+    rango[orden] = ((inicios + fines + 1) / 2)[np.cumsum(nuevos) - 1]
+    resultado[validos] = rango
+    return resultado
+
+
+def p_valores(r, n):
+    """P-valores bilaterales de la prueba t de correlación nula.
+
+    Args:
+        r (np.ndarray): Coeficientes de correlación.
+        n (np.ndarray): Filas usadas en cada coeficiente.
+
+    Returns:
+        np.ndarray: P-valores (nulos si hay menos de 3 filas).
+    """
+    r = np.asarray(r, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grados = n - 2
+        estadistico_t = r * np.sqrt(grados / (1 - r**2))
+        p_valor = 2 * stats.t.sf(np.abs(estadistico_t), np.where(grados > 0, grados, np.nan))
+    return np.where(np.isnan(r), np.nan, p_valor)
+
+
+def correlaciones(df, metodo="pearson", columnas=None, tamano_bloque=100_000, momentos=None):
+    """Calcula la matriz de correlación de todas las columnas numéricas.
+
+    Args:
+        df (pd.DataFrame): Datos de entrada.
+        metodo (str, optional): "pearson" o "spearman". Defaults to "pearson".
+        columnas (list, optional): Columnas a correlacionar. Defaults to
+            todas las numéricas.
+        tamano_bloque (int, optional): Filas por bloque. Defaults to 100_000.
+        momentos (MomentosCruzados, optional): Momentos previos a actualizar,
+            por ejemplo para agregar filas nuevas (solo con "pearson").
+            Defaults to None.
+
+    Returns:
+        Correlaciones: Coeficientes, p-valores y conteos como DataFrames.
+
+    Raises:
+        ValueError: Si el método no es "pearson" ni "spearman".
+    """
+    if metodo not in ("pearson", "spearman"):
+        raise ValueError(f"Método de correlación desconocido: {metodo}")
+    if columnas is None:
+        columnas = df.select_dtypes(include="number").columns
+    valores = df[list(columnas)].apply(pd.to_numeric, errors="coerce")
+    momentos = MomentosCruzados(valores.columns) if momentos is None else momentos
+    matriz = valores.to_numpy(dtype=float)
+    if metodo == "spearman":
+        matriz = np.column_stack([rangos(matriz[:, posicion]) for posicion in range(matriz.shape[1])])
+    for inicio in range(0, len(matriz), tamano_bloque):
+        momentos.actualizar(matriz[inicio: inicio + tamano_bloque])
+    return momentos.correlaciones()
+
+
+def correlaciones_csv(fuente, tamano_bloque=1_000_000, k=200):
+    """Calcula Pearson y Spearman de un CSV sin cargarlo completo en memoria.
+
+    Se hacen dos lecturas: la primera resume cada columna con un sketch de
+    cuantiles y la segunda acumula los momentos de los valores y de sus
+    rangos aproximados.
+
+    Args:
+        fuente (str): Ruta o URL del CSV (se lee dos veces).
+        tamano_bloque (int, optional): Filas leídas por bloque. Defaults to 1_000_000.
+        k (int, optional): Tamaño del sketch de cuantiles. Defaults to 200.
+
+    Returns:
+        dict: "pearson" y "spearman" -> Correlaciones.
+    """
+    resumenes = resumir_csv(fuente, tamano_bloque=tamano_bloque, k=k)
+    columnas = list(resumenes)
+    pearson = MomentosCruzados(columnas)
+    spearman = MomentosCruzados(columnas)
+    for bloque in pd.read_csv(fuente, chunksize=tamano_bloque, usecols=columnas):
+        bloque = bloque[columnas].apply(pd.to_numeric, errors="coerce")
+        pearson.actualizar(bloque)
+        spearman.actualizar(
+            np.column_stack([resumenes[columna].rangos(bloque[columna]) for columna in columnas])
+        )
+    return {"pearson": pearson.correlaciones(), "spearman": spearman.correlaciones()}
+
+
+def orden_por_clusteres(r):
+    """Ordena las columnas agrupando las que están más correlacionadas.
+
+    Usa un agrupamiento jerárquico de enlace promedio con distancia 1 - |r|.
+
+    Args:
+        r (pd.DataFrame): Matriz de correlación.
+
+    Returns:
+        tuple: (posiciones ordenadas, matriz de enlace o None si hay menos de 3 columnas).
+    """
+    if len(r) < 3:
+        return np.arange(len(r)), None
+    distancias = 1 - np.abs(np.nan_to_num(r.to_numpy(dtype=float)))
+    np.fill_diagonal(distancias, 0.0)
+    enlace = hierarchy.linkage(squareform(distancias, checks=False), method="average")
+    return hierarchy.leaves_list(enlace), enlace
+
+
+def figura_correlaciones(resultado, titulo="Matriz de Correlación", alfa=0.05, anotar=None):
+    """Mapa de calor de la matriz de correlación ordenada por clústeres.
+
+    Las celdas con p-valor mayor o igual que `alfa` se muestran atenuadas.
+
+    Args:
+        resultado (Correlaciones): Resultado de `correlaciones`.
+        titulo (str, optional): Título del gráfico. Defaults to "Matriz de Correlación".
+        alfa (float, optional): Nivel de significancia. Defaults to 0.05.
+        anotar (bool, optional): Escribir los coeficientes en las celdas.
+            Defaults to None (solo con 20 columnas o menos).
+
+    Returns:
+        Figure: Figura generada.
+    """
+    orden, enlace = orden_por_clusteres(resultado.r)
+    r = resultado.r.iloc[orden, orden]
+    p_valor = resultado.p_valor.iloc[orden, orden].to_numpy(dtype=float)
+    k = len(r)
+    anotar = k <= 20 if anotar is None else anotar
+
+    lado = min(max(6, 0.35 * k + 3), 30)
+    fig = Figure(figsize=(lado + 1.5, lado + 1.5))
+    rejilla = fig.add_gridspec(2, 2, height_ratios=(1, 6), width_ratios=(20, 1), hspace=0.02, wspace=0.05)
+    ax = fig.add_subplot(rejilla[1, 0])
+    if enlace is not None:
+        ax_arbol = fig.add_subplot(rejilla[0, 0])
+        hierarchy.dendrogram(enlace, ax=ax_arbol, no_labels=True, color_threshold=0, above_threshold_color="gray")
+        ax_arbol.set_axis_off()
+        ax_arbol.set_title(titulo)
+    else:
+        ax.set_title(titulo)
+
+    imagen = ax.imshow(r.to_numpy(dtype=float), cmap="coolwarm", vmin=-1, vmax=1, aspect="auto")
+    no_significativas = np.ma.masked_where(~(p_valor >= alfa), np.ones_like(p_valor))
+    ax.imshow(no_significativas, cmap="Greys", vmin=0, vmax=1, alpha=0.35, aspect="auto")
+    fig.colorbar(imagen, cax=fig.add_subplot(rejilla[1, 1]), label="Coeficiente de correlación")
+
+    ax.set_xticks(range(k))
+    ax.set_yticks(range(k))
+    ax.set_xticklabels(r.columns, rotation=45, ha="right")
+    ax.set_yticklabels(r.index)
+    if anotar:
+        for fila in range(k):
+            for columna in range(k):
+                valor = r.iat[fila, columna]
+                if not np.isnan(valor):
+                    ax.text(columna, fila, f"{valor:.2f}", ha="center", va="center", fontsize=8)
+    return fig
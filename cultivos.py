@@ -3,11 +3,67 @@ import pandas as pd
 import geopandas as gpd
 import numpy as np
 from scipy.stats import gaussian_kde
-import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Cargar datos
-df = pd.read_csv("ruta/a/tu/archivo.csv")
+from almacen import clave_fuente
+from correlaciones import correlaciones
+from graficos_cultivos import GRAFICOS_CULTIVOS, PARES_REGRESION
+from multietiqueta import codificar_etiquetas
+from regresion import estadisticos_suficientes
+from renderizado import renderizar_graficos
+
+RUTA_DATOS = "ruta/a/tu/archivo.csv"
+
+
+@st.cache_data(show_spinner=False)
+def estadisticos_par(clave, x, y, _df):
+    """Estadísticos suficientes de un par de columnas, guardados entre ejecuciones.
+
+    Args:
+        clave (str): Identificador del conjunto de datos (ver `clave_fuente`).
+        x (str): Columna independiente.
+        y (str): Columna dependiente.
+        _df (pd.DataFrame): Datos; no forma parte de la clave de la caché.
+
+    Returns:
+        Suficientes: Estadísticos del par.
+    """
+    return estadisticos_suficientes(_df[x], _df[y])
+
+
+@st.cache_data(show_spinner=False)
+def etiquetas_columna(clave, columna, _df):
+    """Matriz indicadora de una columna de etiquetas, guardada entre ejecuciones.
+
+    Args:
+        clave (str): Identificador del conjunto de datos (ver `clave_fuente`).
+        columna (str): Columna con varias etiquetas por registro.
+        _df (pd.DataFrame): Datos; no forma parte de la clave de la caché.
+
+    Returns:
+        CodificacionEtiquetas: Matriz indicadora y diccionario de términos.
+    """
+    return codificar_etiquetas(_df[columna])
+
+
+@st.cache_data(show_spinner=False)
+def matriz_correlaciones(clave, metodo, _df):
+    """Matriz de correlación de las columnas numéricas, guardada entre ejecuciones.
+
+    Args:
+        clave (str): Identificador del conjunto de datos (ver `clave_fuente`).
+        metodo (str): "pearson" o "spearman".
+        _df (pd.DataFrame): Datos; no forma parte de la clave de la caché.
+
+    Returns:
+        Correlaciones: Coeficientes, p-valores y conteos.
+    """
+    return correlaciones(_df, metodo=metodo)
+
+
+# Cargar datos; la clave cambia cuando cambia el archivo
+clave = clave_fuente("cultivos", archivo=RUTA_DATOS)
+df = pd.read_csv(RUTA_DATOS)
 
 # Asegurarse de que las columnas numéricas no contengan valores nulos
 df["Calidad_Cosecha"] = pd.to_numeric(df["Calidad_Cosecha"], errors='coerce')
@@ -82,107 +138,31 @@ else:
         # 🔹 Mostrar el gráfico en Streamlit
         st.pyplot(fig)
 
-# 🔹 Visualización de la correlación entre variables
-plt.figure(figsize=(8, 5))
-sns.regplot(data=df, x='Humedad_Suelo', y='Rendimiento_Cosecha', scatter_kws={'alpha': 0.5})
-plt.title("📊 Correlación entre Humedad del Suelo y Rendimiento de Cosecha")
-plt.xlabel("Humedad del Suelo (%)")
-plt.ylabel("Rendimiento de Cosecha (kg/ha)")
-plt.grid(True)
-st.pyplot()
-
-plt.figure(figsize=(8, 5))
-sns.histplot(df['Temperatura_Aire'], bins=20, kde=True, color="royalblue")
-plt.title("🌡️ Distribución de la Temperatura del Aire")
-plt.xlabel("Temperatura del Aire (°C)")
-plt.ylabel("Frecuencia")
-plt.grid(True)
-st.pyplot()
-
-plt.figure(figsize=(10, 6))
-sns.boxplot(data=df, x='Método_Cultivo', y='Rendimiento_Cosecha', palette="Set2")
-plt.title("📈 Comparación del Rendimiento por Método de Cultivo")
-plt.xlabel("Método de Cultivo")
-plt.ylabel("Rendimiento de Cosecha (kg/ha)")
-plt.xticks(rotation=45)
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Gráfico de Precipitación vs Rendimiento
-plt.figure(figsize=(8, 5))
-sns.scatterplot(data=df, x='Precipitación_Total', y='Rendimiento_Cosecha', alpha=0.6)
-sns.regplot(data=df, x='Precipitación_Total', y='Rendimiento_Cosecha', scatter=False, color="red")
-plt.title("🌧️ Relación entre Precipitación y Rendimiento de Cosecha")
-plt.xlabel("Precipitación Total (mm)")
-plt.ylabel("Rendimiento de Cosecha (kg/ha)")
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Frecuencia de Enfermedades
-plt.figure(figsize=(10, 6))
-sns.countplot(data=df, y='Enfermedades_Presentes', order=df['Enfermedades_Presentes'].value_counts().index, palette="Reds_r")
-plt.title("🦠 Frecuencia de Enfermedades en los Cultivos")
-plt.xlabel("Cantidad de Cultivos Afectados")
-plt.ylabel("Tipo de Enfermedad")
-plt.grid(axis="x", linestyle="--", alpha=0.6)
-st.pyplot()
-
-# 🔹 Comparación de Calidad de Cosecha por Variedad de Semilla
-plt.figure(figsize=(12, 6))
-sns.boxplot(data=df, x="Variedad_Semilla", y="Calidad_Cosecha", palette="muted")
-plt.title("🌾 Comparación de Calidad de Cosecha por Variedad de Semilla")
-plt.xlabel("Variedad de Semilla")
-plt.ylabel("Calidad de la Cosecha")
-plt.xticks(rotation=45)
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Distribución de los Días de Cultivo
+# 🔹 Columnas derivadas que usan los gráficos
 df["Fecha_Siembra"] = pd.to_datetime(df["Fecha_Siembra"])
 df["Fecha_Cosecha"] = pd.to_datetime(df["Fecha_Cosecha"])
 df["Días_Cultivo"] = (df["Fecha_Cosecha"] - df["Fecha_Siembra"]).dt.days
-plt.figure(figsize=(8, 5))
-sns.histplot(df["Días_Cultivo"], bins=20, kde=True, color="darkgreen")
-plt.title("📅 Distribución de los Días de Cultivo")
-plt.xlabel("Días de Cultivo")
-plt.ylabel("Frecuencia")
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Distribución de Horas de Sol
-plt.figure(figsize=(8, 6))
-sns.histplot(df["Horas_Sol"], bins=20, kde=True)
-plt.title("☀️ Distribución de Horas de Sol Recibidas")
-plt.xlabel("Horas de Sol")
-plt.ylabel("Frecuencia")
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Comparación del Riego Aplicado por Tipo de Suelo
-plt.figure(figsize=(10, 6))
-sns.boxplot(x="Tipo_Suelo", y="Riego_Aplicado", data=df)
-plt.xticks(rotation=45)
-plt.title("💧 Comparación del Riego Aplicado por Tipo de Suelo")
-plt.xlabel("Tipo de Suelo")
-plt.ylabel("Riego Aplicado")
-plt.grid(True)
-st.pyplot()
-
-# 🔹 Relación entre pH del Suelo y Humedad del Suelo
-plt.figure(figsize=(8, 6))
-sns.scatterplot(x="pH_Suelo", y="Humedad_Suelo", data=df, alpha=0.6)
-sns.regplot(x="pH_Suelo", y="Humedad_Suelo", data=df, scatter=False, color="red")
-plt.title("📈 Relación entre pH del Suelo y Humedad del Suelo")
-plt.xlabel("pH del Suelo")
-plt.ylabel("Humedad del Suelo")
-st.pyplot()
-
-# 🔹 Frecuencia de Plagas
-plt.figure(figsize=(12, 6))
-df["Plagas_Presentes"].str.split(", ").explode().value_counts().plot(kind="bar", color="coral")
-plt.title("🐛 Frecuencia de Plagas Presentes en los Cultivos")
-plt.xlabel("Plaga")
-plt.ylabel("Cantidad de Cultivos Afectados")
-plt.xticks(rotation=45)
-plt.grid(axis="y")
-st.pyplot()
+
+# 🔹 Codificar las columnas con varias etiquetas por cultivo una sola vez por archivo
+etiquetas = {
+    "plagas": etiquetas_columna(clave, "Plagas_Presentes", df),
+    "enfermedades": etiquetas_columna(clave, "Enfermedades_Presentes", df),
+}
+
+# 🔹 Estadísticos suficientes de cada par con recta de regresión, calculados
+# una sola vez por archivo y par de columnas
+regresiones = {(x, y): estadisticos_par(clave, x, y, df) for x, y in dict.fromkeys(PARES_REGRESION)}
+extras = {**etiquetas, "regresiones": regresiones}
+
+# 🔹 Matrices de correlación de todas las variables numéricas, una vez por archivo
+extras["correlaciones"] = {
+    "pearson": matriz_correlaciones(clave, "pearson", df),
+    "spearman": matriz_correlaciones(clave, "spearman", df),
+}
+
+# 🔹 Renderizar todos los gráficos en paralelo y mostrarlos en orden
+for resultado in renderizar_graficos(df, GRAFICOS_CULTIVOS, extras=extras):
+    if resultado.error is not None:
+        st.error(f"No se pudo generar el gráfico '{resultado.nombre}': {resultado.error}")
+    else:
+        st.image(resultado.png)
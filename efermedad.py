@@ -1,9 +1,17 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import geopandas as gpd
-from shapely.geometry import Point
+from matplotlib.figure import Figure
+
+from almacen import ALMACEN, clave_fuente
+from estadisticas import describir, leer_csv, resumir
+from imputacion import interpolar_por_grupos
+from mapas import URL_PAISES_50M, cargar_mapa_mundial, figura_coropletas, totales_por_pais
+from progresivo import muestra_estratificada, mostrar_progresivo, pagina_progresiva
+
+# Columnas para estratificar las vistas previas de datos grandes
+ESTRATOS = ["Region", "Enfermedad"]
 
 
 def cargar_datos(archivo=None, url=None):
@@ -14,99 +22,192 @@ def cargar_datos(archivo=None, url=None):
         url (str, optional): URL del archivo CSV. Defaults to None.
 
     Returns:
-        pd.DataFrame: DataFrame con los datos cargados e interpolados.
+        tuple: Vista de solo lectura de los datos cargados e interpolados por
+        grupo (o None) y los datos precalculados al cargarlos: "estadisticas"
+        y "muestra".
     """
-    if archivo is not None:
-        df = pd.read_csv(archivo)
-    elif url is not None:
-        df = pd.read_csv(url)
-    else:
+    if archivo is None and url is None:
         st.error("Debes proporcionar un archivo o una URL.")
-        return None
+        return None, {}
+
+    def leer_y_limpiar():
+        # Resumen estadístico calculado por bloques durante la lectura
+        df, resumenes = leer_csv(archivo if archivo is not None else url)
 
-    # Interpolación lineal para rellenar valores faltantes
-    df = df.interpolate(method="linear")
-    return df
+        # Interpolación lineal por región y enfermedad, ordenada por fecha
+        df = interpolar_por_grupos(df, grupos=["Region", "Enfermedad"], orden="Fecha")
 
+        # Muestra para las vistas previas, compartida por todos los gráficos
+        return df, {"estadisticas": resumenes, "muestra": muestra_estratificada(df, ESTRATOS)}
 
-def mostrar_estadisticas(df):
+    # Datos limpios compartidos por todas las sesiones que abren la misma fuente
+    clave = clave_fuente("efermedad", archivo=archivo, url=url)
+    return ALMACEN.obtener(clave, leer_y_limpiar, persistir=archivo is not None)
+
+
+def mostrar_estadisticas(df, resumenes=None):
     """Muestra estadísticas generales de las variables numéricas.
 
     Args:
         df (pd.DataFrame): DataFrame con los datos.
+        resumenes (dict, optional): Resúmenes calculados al leer el archivo.
+            Defaults to None (se calculan sobre `df`).
     """
     st.write("### Estadísticas Generales de Variables Numéricas")
-    st.write(df.describe())
+    resumenes = resumenes or resumir(df)
+    st.write(describir(resumenes))
+    if resumenes:
+        error = max(resumen.error_rango for resumen in resumenes.values())
+        st.caption(
+            f"Calculadas al leer el archivo, antes de la interpolación. "
+            f"Los percentiles son aproximados (error de rango de ±{error:.1%})."
+        )
 
 
-def mostrar_mapa_calor(df):
-    """Genera un mapa de calor de todas las enfermedades.
+def figura_mapa_calor(df):
+    """Construye el mapa de calor de todas las enfermedades.
 
     Args:
         df (pd.DataFrame): DataFrame con las columnas 'Latitud', 'Longitud', 'Casos_reportados'.
-    """
-    st.write("### Mapa de Calor de Todas las Enfermedades")
 
+    Returns:
+        Figure: Figura con el mapa.
+    """
     # Convertir a GeoDataFrame
-    df["geometry"] = df.apply(lambda row: Point(row["Longitud"], row["Latitud"]), axis=1)
-    gdf = gpd.GeoDataFrame(df, geometry="geometry")
+    gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df["Longitud"], df["Latitud"]))
 
-    # Descargar el mapa mundial desde una URL
-    world_url = "https://naturalearth.s3.amazonaws.com/50m_cultural/ne_50m_admin_0_countries.zip"
-    world = gpd.read_file(world_url)
+    # Mapa mundial descargado una sola vez por proceso
+    world = cargar_mapa_mundial(URL_PAISES_50M)
 
     # Crear el mapa
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
     world.plot(ax=ax, color="lightgray")
     gdf.plot(ax=ax, markersize=df["Casos_reportados"] * 0.1, color="red", alpha=0.5)
-    plt.title("Mapa de Calor de Incidencia de Enfermedades")
-    st.pyplot(fig)
+    ax.set_title("Mapa de Calor de Incidencia de Enfermedades")
+    return fig
 
 
-def mostrar_series_temporales(df):
-    """Genera un gráfico de series temporales de todas las enfermedades.
+def mostrar_mapa_calor(df, muestra=None):
+    """Genera un mapa de calor de todas las enfermedades.
 
     Args:
-        df (pd.DataFrame): DataFrame con las columnas 'Fecha' y 'Casos_reportados'.
+        df (pd.DataFrame): DataFrame con las columnas 'Latitud', 'Longitud', 'Casos_reportados'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
     """
-    st.write("### Series Temporales de Todas las Enfermedades")
+    st.write("### Mapa de Calor de Todas las Enfermedades")
+    mostrar_progresivo(figura_mapa_calor, df, estratos=ESTRATOS, muestra=muestra)
+
+
+def figura_casos_por_pais(df, escala=1.0):
+    """Construye el mapa de coropletas con los casos reportados por país.
 
-    # Agrupar por fecha y enfermedad
+    Args:
+        df (pd.DataFrame): DataFrame con 'Casos_reportados' y 'Pais' (o 'Latitud' y 'Longitud').
+        escala (float, optional): Factor para extrapolar sumas de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura con el mapa.
+    """
+    totales = totales_por_pais(df, "Casos_reportados") * escala
+    return figura_coropletas(totales, "Casos Reportados por País", "Casos reportados")
+
+
+def mostrar_casos_por_pais(df, muestra=None):
+    """Genera el mapa de casos reportados por país.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Latitud', 'Longitud', 'Casos_reportados'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
+    """
+    st.write("### Casos Reportados por País")
+
+    # El país de cada punto se calcula en segundo plano y queda guardado para
+    # este conjunto de datos; después cada mapa es solo una agrupación
+    columnas = ["Latitud", "Longitud", "Casos_reportados"]
+    columnas += [columna for columna in ESTRATOS if columna in df.columns]
+    mostrar_progresivo(
+        figura_casos_por_pais,
+        df[columnas],
+        estratos=ESTRATOS,
+        muestra=muestra[columnas] if muestra is not None else None,
+    )
+
+
+def figura_series_temporales(df, escala=1.0):
+    """Construye el gráfico de series temporales de todas las enfermedades.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Fecha' y 'Casos_reportados'.
+        escala (float, optional): Factor para extrapolar sumas de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura con las series.
+    """
+    # Agrupar por fecha y enfermedad; con fechas reales el eje x usa una escala
+    # temporal en lugar de una etiqueta por cada fecha distinta
     df_agrupado = df.groupby(["Fecha", "Enfermedad"]).sum(numeric_only=True).reset_index()
+    df_agrupado["Fecha"] = pd.to_datetime(df_agrupado["Fecha"], errors="coerce")
+    df_agrupado = df_agrupado.sort_values("Fecha")
 
     # Crear el gráfico
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
     for enfermedad in df_agrupado["Enfermedad"].unique():
         df_enfermedad = df_agrupado[df_agrupado["Enfermedad"] == enfermedad]
-        ax.plot(df_enfermedad["Fecha"], df_enfermedad["Casos_reportados"], label=enfermedad)
-    plt.legend()
-    plt.title("Series Temporales de Incidencia de Enfermedades")
-    plt.xlabel("Fecha")
-    plt.ylabel("Casos Reportados")
-    st.pyplot(fig)
+        ax.plot(df_enfermedad["Fecha"], df_enfermedad["Casos_reportados"] * escala, label=enfermedad)
+    ax.legend()
+    ax.set_title("Series Temporales de Incidencia de Enfermedades")
+    ax.set_xlabel("Fecha")
+    ax.set_ylabel("Casos Reportados")
+    return fig
 
 
-def mostrar_tasas_hospitalizacion(df):
-    """Genera un gráfico de barras de tasas de hospitalización por enfermedad y región.
+def mostrar_series_temporales(df, muestra=None):
+    """Genera un gráfico de series temporales de todas las enfermedades.
 
     Args:
-        df (pd.DataFrame): DataFrame con las columnas 'Enfermedad', 'Region', 'Hospitalizaciones'.
+        df (pd.DataFrame): DataFrame con las columnas 'Fecha' y 'Casos_reportados'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
     """
-    st.write("### Tasas de Hospitalización por Enfermedad y Región")
+    st.write("### Series Temporales de Todas las Enfermedades")
+    mostrar_progresivo(figura_series_temporales, df, estratos=ESTRATOS, muestra=muestra)
+
 
+def figura_tasas_hospitalizacion(df):
+    """Construye el gráfico de barras de hospitalización por enfermedad y región.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Enfermedad', 'Region', 'Hospitalizaciones'.
+
+    Returns:
+        Figure: Figura con las barras.
+    """
     # Agrupar por enfermedad y región
     df_agrupado = df.groupby(["Enfermedad", "Region"])["Hospitalizaciones"].mean().reset_index()
 
     # Crear el gráfico
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
     for region in df_agrupado["Region"].unique():
         df_region = df_agrupado[df_agrupado["Region"] == region]
         ax.bar(df_region["Enfermedad"], df_region["Hospitalizaciones"], label=region)
-    plt.legend()
-    plt.title("Tasas de Hospitalización por Enfermedad y Región")
-    plt.xlabel("Enfermedad")
-    plt.ylabel("Hospitalizaciones")
-    st.pyplot(fig)
+    ax.legend()
+    ax.set_title("Tasas de Hospitalización por Enfermedad y Región")
+    ax.set_xlabel("Enfermedad")
+    ax.set_ylabel("Hospitalizaciones")
+    return fig
+
+
+def mostrar_tasas_hospitalizacion(df, muestra=None):
+    """Genera un gráfico de barras de tasas de hospitalización por enfermedad y región.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Enfermedad', 'Region', 'Hospitalizaciones'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
+    """
+    st.write("### Tasas de Hospitalización por Enfermedad y Región")
+    mostrar_progresivo(figura_tasas_hospitalizacion, df, estratos=ESTRATOS, muestra=muestra)
 
 
 def main():
@@ -123,31 +224,39 @@ def main():
 
     if opcion_carga == "Subir archivo CSV":
         archivo = st.sidebar.file_uploader("Sube un archivo CSV", type=["csv"])
-        df = cargar_datos(archivo=archivo) if archivo is not None else None
+        df, extras = cargar_datos(archivo=archivo) if archivo is not None else (None, {})
     else:
         url = st.sidebar.text_input("Ingresa la URL del archivo CSV")
-        df = cargar_datos(url=url) if url else None
+        df, extras = cargar_datos(url=url) if url else (None, {})
 
     if df is not None:
+        # Mantener viva la vista mientras dure la sesión
+        st.session_state["datos"] = df
+
         # Menú de opciones en la barra lateral
         opcion = st.sidebar.radio(
             "Selecciona una opción:",
             [
                 "Estadísticas Generales",
                 "Mapa de Calor",
+                "Casos por País",
                 "Series Temporales",
                 "Tasas de Hospitalización",
             ],
         )
 
-        if opcion == "Estadísticas Generales":
-            mostrar_estadisticas(df)
-        elif opcion == "Mapa de Calor":
-            mostrar_mapa_calor(df)
-        elif opcion == "Series Temporales":
-            mostrar_series_temporales(df)
-        elif opcion == "Tasas de Hospitalización":
-            mostrar_tasas_hospitalizacion(df)
+        muestra = extras.get("muestra")
+        with pagina_progresiva():
+            if opcion == "Estadísticas Generales":
+                mostrar_estadisticas(df, extras.get("estadisticas"))
+            elif opcion == "Mapa de Calor":
+                mostrar_mapa_calor(df, muestra)
+            elif opcion == "Casos por País":
+                mostrar_casos_por_pais(df, muestra)
+            elif opcion == "Series Temporales":
+                mostrar_series_temporales(df, muestra)
+            elif opcion == "Tasas de Hospitalización":
+                mostrar_tasas_hospitalizacion(df, muestra)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+"""Estadísticas descriptivas incrementales y combinables.
+
+Cada columna numérica se resume con:
+
+- conteo, media y desviación estándar mediante la actualización de Welford
+  por bloques (fórmula de Chan et al.), exactas salvo redondeo;
+- mínimo y máximo exactos;
+- cuantiles aproximados con un sketch KLL, cuyo error de rango es
+  aproximadamente ``2.296 / k**0.9723`` (≈1.3 % con k=200) con una
+  probabilidad del 99 %.
+
+Los resúmenes se pueden combinar entre bloques, archivos o procesos con
+`combinar`, de modo que no hace falta tener todo el conjunto de datos en
+memoria ni volver a recorrerlo cuando se agregan filas nuevas.
+"""
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class _SketchKLL:
+    """Sketch KLL para cuantiles aproximados (Karnin, Lang y Liberty, 2016)."""
+
+    def __init__(self, k, rng):
+        self.k = k
+        self.rng = rng
+        self.niveles = [np.empty(0)]
+
+    def _capacidad(self, nivel):
+        altura = len(self.niveles)
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (altura - 1 - nivel))))
+
+    def _compactar(self):
+        while sum(len(nivel) for nivel in self.niveles) > sum(
+            self._capacidad(nivel) for nivel in range(len(self.niveles))
+        ):
+            for nivel, valores in enumerate(self.niveles):
+                if len(valores) >= self._capacidad(nivel):
+                    break
+            if nivel + 1 == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            valores = np.sort(valores)
+            # Con una cantidad impar, el último valor se queda en su nivel.
+            sobrante = valores[len(valores) - len(valores) % 2:]
+            promovidos = valores[self.rng.integers(2): len(valores) - len(sobrante): 2]
+            self.niveles[nivel] = sobrante
+            self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+
+    def agregar(self, valores):
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+
+    def combinar(self, otro):
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for nivel, valores in enumerate(otro.niveles):
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], valores])
+        self._compactar()
+
+    def cuantiles(self, probabilidades):
+        valores = np.concatenate(self.niveles)
+        if not len(valores):
+            return np.full(len(probabilidades), np.nan)
+        pesos = np.concatenate(
+            [np.full(len(nivel), 2.0 ** altura) for altura, nivel in enumerate(self.niveles)]
+        )
+        orden = np.argsort(valores, kind="stable")
+        acumulado = np.cumsum(pesos[orden])
+        rangos = np.asarray(probabilidades) * acumulado[-1]
+        posiciones = np.minimum(np.searchsorted(acumulado, rangos, side="left"), len(valores) - 1)
+        return valores[orden][posiciones]
+
+    def rangos(self, consultas):
+        valores = np.concatenate(self.niveles)
+        if not len(valores):
+            return np.full(len(consultas), np.nan)
+        pesos = np.concatenate(
+            [np.full(len(nivel), 2.0 ** altura) for altura, nivel in enumerate(self.niveles)]
+        )
+        orden = np.argsort(valores, kind="stable")
+        acumulado = np.concatenate([[0.0], np.cumsum(pesos[orden])])
+        # Rango medio: los empates reciben el promedio de sus posiciones.
+        menores = acumulado[np.searchsorted(valores[orden], consultas, side="left")]
+        hasta = acumulado[np.searchsorted(valores[orden], consultas, side="right")]
+        rangos = (menores + hasta) / (2 * acumulado[-1])
+        return np.where(np.isnan(consultas), np.nan, rangos)
+
+
+class ResumenNumerico:
+    """Resumen incremental de una variable numérica.
+
+    Args:
+        k (int, optional): Tamaño del sketch de cuantiles; a mayor k, menor
+            error y más memoria. Defaults to 200.
+        semilla (int, optional): Semilla del generador aleatorio. Defaults to None.
+    """
+
+    def __init__(self, k=200, semilla=None):
+        self.conteo = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = np.nan
+        self.maximo = np.nan
+        self._sketch = _SketchKLL(k, np.random.default_rng(semilla))
+
+    @property
+    def error_rango(self):
+        """Error de rango normalizado aproximado de los cuantiles."""
+        return 2.296 / self._sketch.k ** 0.9723
+
+    @property
+    def desviacion(self):
+        """Desviación estándar muestral (ddof=1, igual que `DataFrame.describe`)."""
+        if self.conteo < 2:
+            return np.nan
+        return float(np.sqrt(self._m2 / (self.conteo - 1)))
+
+    def _combinar_momentos(self, conteo, media, m2, minimo, maximo):
+        total = self.conteo + conteo
+        delta = media - self.media
+        self.media += delta * conteo / total
+        self._m2 += m2 + delta**2 * self.conteo * conteo / total
+        self.conteo = total
+        self.minimo = np.fmin(self.minimo, minimo)
+        self.maximo = np.fmax(self.maximo, maximo)
+
+    def actualizar(self, valores):
+        """Incorpora un bloque de valores; los nulos se ignoran.
+
+        Args:
+            valores (array-like): Valores numéricos del bloque.
+        """
+        valores = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float)
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return
+        media = valores.mean()
+        self._combinar_momentos(
+            len(valores), media, float(((valores - media) ** 2).sum()), valores.min(), valores.max()
+        )
+        self._sketch.agregar(valores)
+
+    def combinar(self, otro):
+        """Incorpora otro resumen calculado sobre datos distintos.
+
+        Args:
+            otro (ResumenNumerico): Resumen a combinar.
+        """
+        if otro.conteo:
+            self._combinar_momentos(otro.conteo, otro.media, otro._m2, otro.minimo, otro.maximo)
+            self._sketch.combinar(otro._sketch)
+
+    def cuantiles(self, probabilidades=PERCENTILES):
+        """Devuelve los cuantiles aproximados pedidos.
+
+        Args:
+            probabilidades (tuple, optional): Valores entre 0 y 1. Defaults to PERCENTILES.
+
+        Returns:
+            np.ndarray: Cuantiles en el mismo orden.
+        """
+        return self._sketch.cuantiles(probabilidades)
+
+    def rangos(self, valores):
+        """Devuelve el rango relativo aproximado (entre 0 y 1) de cada valor.
+
+        Es la inversa de `cuantiles`: los valores empatados reciben el rango
+        medio y los nulos se conservan como nulos.
+
+        Args:
+            valores (array-like): Valores a ubicar en la distribución resumida.
+
+        Returns:
+            np.ndarray: Rango relativo de cada valor.
+        """
+        valores = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float)
+        return self._sketch.rangos(valores)
+
+
+def resumir(df, tamano_bloque=1_000_000, resumenes=None, k=200):
+    """Resume las columnas numéricas de un DataFrame recorriéndolo por bloques.
+
+    Args:
+        df (pd.DataFrame): Datos a resumir.
+        tamano_bloque (int, optional): Filas por bloque. Defaults to 1_000_000.
+        resumenes (dict, optional): Resúmenes previos a actualizar, por
+            ejemplo para agregar filas nuevas. Defaults to None.
+        k (int, optional): Tamaño del sketch de cuantiles. Defaults to 200.
+
+    Returns:
+        dict: Columna -> ResumenNumerico.
+    """
+    resumenes = {} if resumenes is None else resumenes
+    numericas = df.select_dtypes(include="number").columns
+    for inicio in range(0, len(df), tamano_bloque):
+        bloque = df.iloc[inicio: inicio + tamano_bloque]
+        for columna in numericas:
+            resumenes.setdefault(columna, ResumenNumerico(k=k)).actualizar(bloque[columna])
+    return resumenes
+
+
+def resumir_csv(fuente, tamano_bloque=1_000_000, k=200):
+    """Resume un CSV sin cargarlo completo en memoria.
+
+    Args:
+        fuente (str | file-like): Ruta, URL o archivo CSV.
+        tamano_bloque (int, optional): Filas leídas por bloque. Defaults to 1_000_000.
+        k (int, optional): Tamaño del sketch de cuantiles. Defaults to 200.
+
+    Returns:
+        dict: Columna -> ResumenNumerico.
+    """
+    resumenes = {}
+    for bloque in pd.read_csv(fuente, chunksize=tamano_bloque):
+        resumir(bloque, tamano_bloque=tamano_bloque, resumenes=resumenes, k=k)
+    return resumenes
+
+
+def leer_csv(fuente, tamano_bloque=1_000_000, k=200):
+    """Lee un CSV por bloques y lo resume mientras se lee.
+
+    El resumen se calcula bloque a bloque durante la lectura, sin una segunda
+    pasada sobre el DataFrame completo. Describe los valores tal como están
+    en el archivo: los nulos se ignoran. Las columnas cuyo tipo cambia entre
+    bloques se vuelven a leer y no se resumen si no resultan numéricas.
+
+    Args:
+        fuente (str | file-like): Ruta, URL o archivo CSV.
+        tamano_bloque (int, optional): Filas leídas por bloque. Defaults to 1_000_000.
+        k (int, optional): Tamaño del sketch de cuantiles. Defaults to 200.
+
+    Returns:
+        tuple: (DataFrame completo, dict columna -> ResumenNumerico).
+    """
+    resumenes = {}
+    bloques = []
+    for bloque in pd.read_csv(fuente, chunksize=tamano_bloque):
+        resumir(bloque, tamano_bloque=tamano_bloque, resumenes=resumenes, k=k)
+        bloques.append(bloque)
+    df = pd.concat(bloques, ignore_index=True)
+
+    # El tipo se infiere en cada bloque: una columna numérica en unos bloques
+    # y de texto en otros queda como `object`. Esas columnas se vuelven a leer
+    # completas para tener el mismo tipo que una lectura única.
+    mixtas = [
+        columna
+        for columna in df.columns
+        if df[columna].dtype == object and any(bloque[columna].dtype != object for bloque in bloques)
+    ]
+    if mixtas:
+        if hasattr(fuente, "seek"):
+            fuente.seek(0)
+        df[mixtas] = pd.read_csv(fuente, usecols=mixtas)[mixtas]
+
+    # Solo se resumen las columnas que son numéricas en el DataFrame completo
+    numericas = df.select_dtypes(include="number").columns
+    return df, {columna: resumen for columna, resumen in resumenes.items() if columna in numericas}
+
+
+def combinar_resumenes(*grupos):
+    """Combina varios diccionarios de resúmenes columna a columna.
+
+    Args:
+        *grupos (dict): Resultados de `resumir` o `resumir_csv`.
+
+    Returns:
+        dict: Columna -> ResumenNumerico combinado.
+    """
+    combinados = {}
+    for resumenes in grupos:
+        for columna, resumen in resumenes.items():
+            if columna not in combinados:
+                combinados[columna] = ResumenNumerico(k=resumen._sketch.k)
+            combinados[columna].combinar(resumen)
+    return combinados
+
+
+def describir(resumenes):
+    """Construye una tabla con el mismo formato que `DataFrame.describe()`.
+
+    Args:
+        resumenes (dict): Columna -> ResumenNumerico.
+
+    Returns:
+        pd.DataFrame: Estadísticas por columna.
+    """
+    etiquetas = [f"{p:.0%}" for p in PERCENTILES]
+    tabla = {}
+    for columna, resumen in resumenes.items():
+        fila = [resumen.conteo, resumen.media if resumen.conteo else np.nan, resumen.desviacion, resumen.minimo]
+        fila += list(resumen.cuantiles())
+        fila.append(resumen.maximo)
+        tabla[columna] = fila
+    return pd.DataFrame(tabla, index=["count", "mean", "std", "min", *etiquetas, "max"])
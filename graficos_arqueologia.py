@@ -0,0 +1,219 @@
+import pandas as pd
+from matplotlib.figure import Figure
+
+from correlaciones import correlaciones, figura_correlaciones
+from imputacion import imputar
+from mapas import URL_PAISES_110M, cargar_mapa_mundial, figura_coropletas, totales_por_pais
+
+# Columnas para estratificar las vistas previas de datos grandes
+ESTRATOS = ["Cultura_Asociada"]
+
+# Numéricas lineales, categóricas con la moda y fechas hacia adelante
+ESTRATEGIAS_IMPUTACION = {
+    "Edad_Aprox_Anios": "lineal",
+    "Profundidad_Excavación_m": "lineal",
+    "Nombre_Artefacto": "moda",
+    "Ubicación_Descubrimiento": "moda",
+    "Investigador_Principal": "moda",
+    "Fecha_Descubrimiento": "ffill",
+}
+
+
+def limpiar_datos(df):
+    """Interpola todas las columnas de los datos arqueológicos en una sola pasada.
+
+    Args:
+        df (pd.DataFrame): Datos leídos del CSV.
+
+    Returns:
+        pd.DataFrame: Copia con fechas convertidas y valores faltantes imputados.
+    """
+    df = df.assign(Fecha_Descubrimiento=pd.to_datetime(df["Fecha_Descubrimiento"], errors="coerce"))
+    return imputar(df, ESTRATEGIAS_IMPUTACION)
+
+
+def figura_artefactos_por_cultura(df, escala=1.0):
+    """Cantidad de artefactos por cultura.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Cultura_Asociada'.
+        escala (float, optional): Factor para extrapolar conteos de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    conteo_culturas = df["Cultura_Asociada"].value_counts() * escala
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    conteo_culturas.plot(kind="bar", color="skyblue", edgecolor="black", ax=ax)
+
+    ax.set_xlabel("Cultura")
+    ax.set_ylabel("Cantidad de Artefactos")
+    ax.set_title("Cantidad de Artefactos por Cultura")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+    return fig
+
+
+def figura_edad_profundidad(df, correlacion=None):
+    """Relación entre edad y profundidad del artefacto.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Edad_Aprox_Anios' y 'Profundidad_Excavación_m'
+            sin valores nulos.
+        correlacion (float, optional): Coeficiente de Pearson tomado de la
+            matriz de correlación. Defaults to None (se calcula sobre `df`).
+
+    Returns:
+        Figure: Figura generada.
+    """
+    if correlacion is None:
+        columnas = ["Edad_Aprox_Anios", "Profundidad_Excavación_m"]
+        correlacion = correlaciones(df, columnas=columnas).r.loc[columnas[0], columnas[1]]
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    ax.scatter(
+        df["Edad_Aprox_Anios"],
+        df["Profundidad_Excavación_m"],
+        alpha=0.6,
+        color="royalblue",
+    )
+
+    ax.set_xlabel("Edad Aproximada del Artefacto (años)")
+    ax.set_ylabel("Profundidad del Hallazgo (metros)")
+    ax.set_title(
+        f"Relación entre Edad y Profundidad\nCorrelación de Pearson: {correlacion:.2f}"
+    )
+    return fig
+
+
+def figura_matriz_correlaciones(df, metodo="pearson"):
+    """Matriz de correlación de las columnas numéricas, agrupada por similitud.
+
+    Args:
+        df (pd.DataFrame): Datos arqueológicos.
+        metodo (str, optional): "pearson" o "spearman". Defaults to "pearson".
+
+    Returns:
+        Figure: Figura generada.
+    """
+    return figura_correlaciones(correlaciones(df, metodo), f"Correlación de {metodo.capitalize()}")
+
+
+def figura_materiales_por_cultura(df, escala=1.0):
+    """Distribución de materiales según la cultura asociada.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Cultura_Asociada' y 'Material'.
+        escala (float, optional): Factor para extrapolar conteos de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    datos_filtrados = df.dropna(subset=["Cultura_Asociada", "Material"])
+    conteo_materiales = datos_filtrados.groupby(["Cultura_Asociada", "Material"]).size().unstack(fill_value=0)
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    (conteo_materiales * escala).plot(kind="bar", stacked=True, ax=ax, colormap="viridis")
+
+    ax.set_xlabel("Cultura Asociada")
+    ax.set_ylabel("Cantidad de Artefactos")
+    ax.set_title("Distribución de Materiales según la Cultura Asociada")
+    ax.legend(title="Material", bbox_to_anchor=(1.05, 1), loc="upper left")
+    return fig
+
+
+def figura_mapa_artefactos(df):
+    """Ubicación geográfica de los artefactos.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Latitud' y 'Longitud' sin valores nulos.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    gdf = cargar_mapa_mundial(URL_PAISES_110M)
+
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    gdf.plot(ax=ax, color="lightgray", edgecolor="black")
+    ax.scatter(
+        df["Longitud"],
+        df["Latitud"],
+        c="red",
+        marker="o",
+        alpha=0.7,
+        label="Artefactos",
+    )
+
+    ax.set_title("Ubicación Geográfica de los Artefactos")
+    ax.set_xlabel("Longitud")
+    ax.set_ylabel("Latitud")
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+
+def figura_artefactos_por_pais(df, escala=1.0):
+    """Cantidad de artefactos encontrados en cada país.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Pais' (o 'Latitud' y 'Longitud' sin valores nulos).
+        escala (float, optional): Factor para extrapolar conteos de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    totales = totales_por_pais(df, url=URL_PAISES_110M) * escala
+    return figura_coropletas(totales, "Artefactos por País", "Cantidad de artefactos", url=URL_PAISES_110M)
+
+
+def figura_patrones_por_cultura(df, escala=1.0):
+    """Patrones decorativos por cultura.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Cultura_Asociada' y 'Patrones_Decorativos'.
+        escala (float, optional): Factor para extrapolar conteos de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    patrones_por_cultura = df.groupby(["Cultura_Asociada", "Patrones_Decorativos"]).size().unstack()
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    (patrones_por_cultura * escala).plot(kind="bar", stacked=True, ax=ax, colormap="viridis")
+
+    ax.set_xlabel("Cultura Asociada")
+    ax.set_ylabel("Cantidad de Artefactos")
+    ax.set_title("Patrones Decorativos por Cultura")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+    ax.legend(title="Patrones Decorativos", bbox_to_anchor=(1.05, 1), loc="upper left")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    return fig
+
+
+def figura_tendencia_anual(df, escala=1.0):
+    """Tendencia de descubrimientos por año.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Fecha_Descubrimiento'.
+        escala (float, optional): Factor para extrapolar conteos de una muestra. Defaults to 1.0.
+
+    Returns:
+        Figure: Figura generada.
+    """
+    fechas = pd.to_datetime(df["Fecha_Descubrimiento"], errors="coerce")
+    hallazgos_por_anio = fechas.dt.year.value_counts().sort_index() * escala
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.plot(hallazgos_por_anio.index, hallazgos_por_anio.values, marker="o", linestyle="-", color="b")
+
+    ax.set_xlabel("Año de Descubrimiento")
+    ax.set_ylabel("Cantidad de Artefactos")
+    ax.set_title("Tendencia de Descubrimientos por Año")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    return fig
@@ -0,0 +1,334 @@
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from correlaciones import figura_correlaciones
+from multietiqueta import coocurrencia, frecuencias, promedio_por_etiqueta
+from regresion import dibujar_regresion
+
+
+def grafico_humedad_rendimiento(df, regresiones=None):
+    """Correlación entre humedad del suelo y rendimiento de cosecha.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Humedad_Suelo' y 'Rendimiento_Cosecha'.
+        regresiones (dict, optional): Estadísticos suficientes por par de columnas. Defaults to None.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    dibujar_regresion(
+        ax,
+        df,
+        "Humedad_Suelo",
+        "Rendimiento_Cosecha",
+        suficientes=(regresiones or {}).get(("Humedad_Suelo", "Rendimiento_Cosecha")),
+        scatter_kws={"alpha": 0.5},
+    )
+    ax.set_title("📊 Correlación entre Humedad del Suelo y Rendimiento de Cosecha")
+    ax.set_xlabel("Humedad del Suelo (%)")
+    ax.set_ylabel("Rendimiento de Cosecha (kg/ha)")
+    ax.grid(True)
+    return fig
+
+
+def grafico_temperatura(df):
+    """Distribución de la temperatura del aire.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Temperatura_Aire'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.histplot(df["Temperatura_Aire"], bins=20, kde=True, color="royalblue", ax=ax)
+    ax.set_title("🌡️ Distribución de la Temperatura del Aire")
+    ax.set_xlabel("Temperatura del Aire (°C)")
+    ax.set_ylabel("Frecuencia")
+    ax.grid(True)
+    return fig
+
+
+def grafico_rendimiento_metodo(df):
+    """Comparación del rendimiento por método de cultivo.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Método_Cultivo' y 'Rendimiento_Cosecha'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(data=df, x="Método_Cultivo", y="Rendimiento_Cosecha", palette="Set2", ax=ax)
+    ax.set_title("📈 Comparación del Rendimiento por Método de Cultivo")
+    ax.set_xlabel("Método de Cultivo")
+    ax.set_ylabel("Rendimiento de Cosecha (kg/ha)")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.grid(True)
+    return fig
+
+
+def grafico_precipitacion_rendimiento(df, regresiones=None):
+    """Relación entre precipitación y rendimiento de cosecha.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Precipitación_Total' y 'Rendimiento_Cosecha'.
+        regresiones (dict, optional): Estadísticos suficientes por par de columnas. Defaults to None.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.scatterplot(data=df, x="Precipitación_Total", y="Rendimiento_Cosecha", alpha=0.6, ax=ax)
+    dibujar_regresion(
+        ax,
+        df,
+        "Precipitación_Total",
+        "Rendimiento_Cosecha",
+        suficientes=(regresiones or {}).get(("Precipitación_Total", "Rendimiento_Cosecha")),
+        scatter=False,
+        color="red",
+    )
+    ax.set_title("🌧️ Relación entre Precipitación y Rendimiento de Cosecha")
+    ax.set_xlabel("Precipitación Total (mm)")
+    ax.set_ylabel("Rendimiento de Cosecha (kg/ha)")
+    ax.grid(True)
+    return fig
+
+
+def grafico_enfermedades(df, enfermedades):
+    """Frecuencia de enfermedades en los cultivos.
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos de cultivos.
+        enfermedades (CodificacionEtiquetas): Codificación de 'Enfermedades_Presentes'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    conteos = frecuencias(enfermedades)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=conteos.values, y=conteos.index, hue=conteos.index, palette="Reds_r", legend=False, ax=ax)
+    ax.set_title("🦠 Frecuencia de Enfermedades en los Cultivos")
+    ax.set_xlabel("Cantidad de Cultivos Afectados")
+    ax.set_ylabel("Tipo de Enfermedad")
+    ax.grid(axis="x", linestyle="--", alpha=0.6)
+    return fig
+
+
+def grafico_calidad_variedad(df):
+    """Comparación de calidad de cosecha por variedad de semilla.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Variedad_Semilla' y 'Calidad_Cosecha'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.boxplot(data=df, x="Variedad_Semilla", y="Calidad_Cosecha", palette="muted", ax=ax)
+    ax.set_title("🌾 Comparación de Calidad de Cosecha por Variedad de Semilla")
+    ax.set_xlabel("Variedad de Semilla")
+    ax.set_ylabel("Calidad de la Cosecha")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.grid(True)
+    return fig
+
+
+def grafico_dias_cultivo(df):
+    """Distribución de los días de cultivo.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Días_Cultivo'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.histplot(df["Días_Cultivo"], bins=20, kde=True, color="darkgreen", ax=ax)
+    ax.set_title("📅 Distribución de los Días de Cultivo")
+    ax.set_xlabel("Días de Cultivo")
+    ax.set_ylabel("Frecuencia")
+    ax.grid(True)
+    return fig
+
+
+def grafico_horas_sol(df):
+    """Distribución de horas de sol recibidas.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Horas_Sol'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.histplot(df["Horas_Sol"], bins=20, kde=True, ax=ax)
+    ax.set_title("☀️ Distribución de Horas de Sol Recibidas")
+    ax.set_xlabel("Horas de Sol")
+    ax.set_ylabel("Frecuencia")
+    ax.grid(True)
+    return fig
+
+
+def grafico_riego_suelo(df):
+    """Comparación del riego aplicado por tipo de suelo.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Tipo_Suelo' y 'Riego_Aplicado'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(x="Tipo_Suelo", y="Riego_Aplicado", data=df, ax=ax)
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title("💧 Comparación del Riego Aplicado por Tipo de Suelo")
+    ax.set_xlabel("Tipo de Suelo")
+    ax.set_ylabel("Riego Aplicado")
+    ax.grid(True)
+    return fig
+
+
+def grafico_ph_humedad(df, regresiones=None):
+    """Relación entre pH del suelo y humedad del suelo.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'pH_Suelo' y 'Humedad_Suelo'.
+        regresiones (dict, optional): Estadísticos suficientes por par de columnas. Defaults to None.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.scatterplot(x="pH_Suelo", y="Humedad_Suelo", data=df, alpha=0.6, ax=ax)
+    dibujar_regresion(
+        ax,
+        df,
+        "pH_Suelo",
+        "Humedad_Suelo",
+        suficientes=(regresiones or {}).get(("pH_Suelo", "Humedad_Suelo")),
+        scatter=False,
+        color="red",
+    )
+    ax.set_title("📈 Relación entre pH del Suelo y Humedad del Suelo")
+    ax.set_xlabel("pH del Suelo")
+    ax.set_ylabel("Humedad del Suelo")
+    return fig
+
+
+def grafico_plagas(df, plagas):
+    """Frecuencia de plagas presentes en los cultivos.
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos de cultivos.
+        plagas (CodificacionEtiquetas): Codificación de 'Plagas_Presentes'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    fig, ax = plt.subplots(figsize=(12, 6))
+    frecuencias(plagas).plot(kind="bar", color="coral", ax=ax)
+    ax.set_title("🐛 Frecuencia de Plagas Presentes en los Cultivos")
+    ax.set_xlabel("Plaga")
+    ax.set_ylabel("Cantidad de Cultivos Afectados")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.grid(axis="y")
+    return fig
+
+
+def grafico_coocurrencia_plagas_enfermedades(df, plagas, enfermedades):
+    """Mapa de calor de cultivos que presentan a la vez cada plaga y enfermedad.
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos de cultivos.
+        plagas (CodificacionEtiquetas): Codificación de 'Plagas_Presentes'.
+        enfermedades (CodificacionEtiquetas): Codificación de 'Enfermedades_Presentes'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    tabla = coocurrencia(plagas, enfermedades)
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(tabla, annot=True, fmt="d", cmap="YlOrRd", ax=ax)
+    ax.set_title("🐛🦠 Coocurrencia de Plagas y Enfermedades")
+    ax.set_xlabel("Enfermedad")
+    ax.set_ylabel("Plaga")
+    return fig
+
+
+def grafico_rendimiento_por_plaga(df, plagas):
+    """Rendimiento promedio de los cultivos afectados por cada plaga.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Rendimiento_Cosecha'.
+        plagas (CodificacionEtiquetas): Codificación de 'Plagas_Presentes'.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    promedios = promedio_por_etiqueta(plagas, df["Rendimiento_Cosecha"])["promedio"].sort_values()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    promedios.plot(kind="bar", color="olivedrab", ax=ax)
+    ax.axhline(df["Rendimiento_Cosecha"].mean(), color="black", linestyle="--", label="Promedio general")
+    ax.set_title("🐛 Rendimiento Promedio según Plaga Presente")
+    ax.set_xlabel("Plaga")
+    ax.set_ylabel("Rendimiento de Cosecha (kg/ha)")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.grid(axis="y")
+    ax.legend()
+    return fig
+
+
+def grafico_correlaciones(df, correlaciones):
+    """Matriz de correlación de Pearson de las variables numéricas.
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos de cultivos.
+        correlaciones (dict): "pearson" y "spearman" -> Correlaciones precalculadas.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    return figura_correlaciones(correlaciones["pearson"], "📈 Correlación de Pearson entre Variables")
+
+
+def grafico_correlaciones_spearman(df, correlaciones):
+    """Matriz de correlación de Spearman (relaciones monótonas).
+
+    Args:
+        df (pd.DataFrame): DataFrame con los datos de cultivos.
+        correlaciones (dict): "pearson" y "spearman" -> Correlaciones precalculadas.
+
+    Returns:
+        matplotlib.figure.Figure: Figura generada.
+    """
+    return figura_correlaciones(correlaciones["spearman"], "📈 Correlación de Spearman entre Variables")
+
+
+# Pares de columnas con recta de regresión, para precalcular sus estadísticos.
+PARES_REGRESION = [
+    ("Humedad_Suelo", "Rendimiento_Cosecha"),
+    ("Precipitación_Total", "Rendimiento_Cosecha"),
+    ("pH_Suelo", "Humedad_Suelo"),
+]
+
+# Gráficos de la página de cultivos, en el orden en que se muestran.
+GRAFICOS_CULTIVOS = [
+    ("humedad_rendimiento", grafico_humedad_rendimiento),
+    ("temperatura", grafico_temperatura),
+    ("rendimiento_metodo", grafico_rendimiento_metodo),
+    ("precipitacion_rendimiento", grafico_precipitacion_rendimiento),
+    ("enfermedades", grafico_enfermedades),
+    ("calidad_variedad", grafico_calidad_variedad),
+    ("dias_cultivo", grafico_dias_cultivo),
+    ("horas_sol", grafico_horas_sol),
+    ("riego_suelo", grafico_riego_suelo),
+    ("ph_humedad", grafico_ph_humedad),
+    ("plagas", grafico_plagas),
+    ("coocurrencia_plagas_enfermedades", grafico_coocurrencia_plagas_enfermedades),
+    ("rendimiento_por_plaga", grafico_rendimiento_por_plaga),
+    ("correlaciones", grafico_correlaciones),
+    ("correlaciones_spearman", grafico_correlaciones_spearman),
+]
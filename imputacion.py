@@ -0,0 +1,203 @@
+"""Imputación de valores faltantes por grupos en una sola pasada vectorizada.
+
+Se declara una estrategia por columna y, opcionalmente, las columnas que
+definen los grupos y el orden dentro de cada grupo. Los datos se ordenan una
+sola vez, se dividen en segmentos contiguos (uno por grupo) y cada estrategia
+se resuelve con operaciones de NumPy sobre todo el arreglo, sin recorrer los
+grupos en Python.
+
+Estrategias disponibles:
+
+- "lineal": interpolación lineal respecto a la columna de orden (o a la
+  posición si no hay orden); en los extremos del grupo se repite el valor
+  válido más cercano.
+- "moda": valor más frecuente del grupo (el menor en caso de empate).
+- "ffill": último valor válido anterior dentro del grupo.
+"""
+
+import numpy as np
+import pandas as pd
+
+ESTRATEGIAS = ("lineal", "moda", "ffill")
+
+
+def _codigos_grupo(df, grupos):
+    """Devuelve un código entero por fila que identifica su grupo."""
+    if not grupos:
+        return np.zeros(len(df), dtype=np.int64)
+    codigos = np.zeros(len(df), dtype=np.int64)
+    for columna in grupos:
+        codigo, niveles = pd.factorize(df[columna], use_na_sentinel=False)
+        codigos = pd.factorize(codigos * len(niveles) + codigo)[0]
+    return codigos
+
+
+def _eje_orden(df, orden):
+    """Convierte la columna de orden en un eje numérico (NaN si falta)."""
+    if orden is None:
+        return np.arange(len(df), dtype=float)
+    serie = df[orden]
+    if not (pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_datetime64_any_dtype(serie)):
+        serie = pd.to_datetime(serie, errors="coerce")
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        valores = serie.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+        valores[serie.isna().to_numpy()] = np.nan
+        return valores
+    return serie.to_numpy(dtype=float, na_value=np.nan)
+
+
+def _anterior_valido(validos, inicio_segmento):
+    """Posición del último valor válido anterior dentro del segmento (-1 si no hay)."""
+    posiciones = np.where(validos, np.arange(len(validos)), -1)
+    anterior = np.maximum.accumulate(posiciones) if len(posiciones) else posiciones
+    return np.where(anterior >= inicio_segmento, anterior, -1)
+
+
+def _siguiente_valido(validos, fin_segmento):
+    """Posición del siguiente valor válido dentro del segmento (-1 si no hay)."""
+    n = len(validos)
+    posiciones = np.where(validos, np.arange(n), n)
+    siguiente = np.minimum.accumulate(posiciones[::-1])[::-1] if n else posiciones
+    return np.where(siguiente < fin_segmento, siguiente, -1)
+
+
+def _tomar(valores, indices):
+    """Toma valores por posición conservando el tipo; -1 produce un faltante."""
+    tomados = pd.Series(valores).take(np.maximum(indices, 0)).reset_index(drop=True)
+    return tomados.where(indices >= 0).to_numpy()
+
+
+def _lineal(valores, faltantes, eje, inicio, fin):
+    """Interpolación lineal por segmentos respecto al eje de orden."""
+    es_fecha = np.issubdtype(valores.dtype, np.datetime64)
+    if es_fecha:
+        numeros = valores.astype("datetime64[ns]").astype(np.int64).astype(float)
+    else:
+        numeros = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float, copy=True)
+    numeros[faltantes] = np.nan
+    validos = ~faltantes
+    anterior = _anterior_valido(validos, inicio)
+    siguiente = _siguiente_valido(validos, fin)
+
+    y0 = numeros[np.maximum(anterior, 0)]
+    y1 = numeros[np.maximum(siguiente, 0)]
+    x0 = eje[np.maximum(anterior, 0)]
+    x1 = eje[np.maximum(siguiente, 0)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraccion = (eje - x0) / (x1 - x0)
+        interpolado = np.where(np.isfinite(fraccion), y0 + (y1 - y0) * fraccion, y0)
+
+    relleno = np.where(anterior >= 0, np.where(siguiente >= 0, interpolado, y0), np.where(siguiente >= 0, y1, np.nan))
+    resultado = np.where(faltantes, relleno, numeros)
+    if es_fecha:
+        return pd.to_datetime(resultado).to_numpy()
+    return resultado
+
+
+def _moda(valores, faltantes, segmento, numero_segmentos):
+    """Rellena con el valor más frecuente de cada segmento."""
+    codigos, niveles = pd.factorize(pd.Series(valores), sort=True)
+    validos = ~faltantes & (codigos >= 0)
+    if not validos.any():
+        return valores
+    pares, conteos = np.unique(
+        segmento[validos].astype(np.int64) * len(niveles) + codigos[validos],
+        return_counts=True,
+    )
+    segmento_par, codigo_par = np.divmod(pares, len(niveles))
+    # Por segmento: mayor conteo primero y, a igualdad, el código menor.
+    orden = np.lexsort((codigo_par, -conteos, segmento_par))
+    segmento_par, codigo_par = segmento_par[orden], codigo_par[orden]
+    primero = np.r_[True, segmento_par[1:] != segmento_par[:-1]]
+
+    moda_segmento = np.full(numero_segmentos, -1, dtype=np.int64)
+    moda_segmento[segmento_par[primero]] = codigo_par[primero]
+    codigo_relleno = moda_segmento[segmento]
+    resultado = pd.Series(valores).copy()
+    rellenar = faltantes & (codigo_relleno >= 0)
+    resultado[rellenar] = niveles.take(codigo_relleno[rellenar])
+    return resultado.to_numpy()
+
+
+def _restaurar_tipo(valores, original):
+    """Devuelve una Series con el tipo de la columna original si es posible."""
+    serie = pd.Series(valores, index=original.index, name=original.name)
+    try:
+        return serie.astype(original.dtype)
+    except (TypeError, ValueError):
+        return serie
+
+
+def imputar(df, estrategias, grupos=None, orden=None):
+    """Imputa valores faltantes columna por columna según su estrategia.
+
+    Args:
+        df (pd.DataFrame): Datos con valores faltantes.
+        estrategias (dict): Columna -> "lineal", "moda" o "ffill".
+        grupos (list, optional): Columnas que definen los grupos. Defaults to None.
+        orden (str, optional): Columna que ordena las filas dentro de cada
+            grupo (por ejemplo 'Fecha'). Si es None se usa el orden del
+            archivo. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Copia de `df` con las columnas imputadas.
+    """
+    for columna, estrategia in estrategias.items():
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estrategia desconocida para '{columna}': {estrategia}")
+
+    grupos = list(grupos or [])
+    codigos = _codigos_grupo(df, grupos)
+    eje_original = _eje_orden(df, orden)
+
+    # Un solo ordenamiento estable: por grupo y, dentro del grupo, por el eje.
+    permutacion = np.lexsort((np.arange(len(df)), eje_original, codigos))
+    segmento = codigos[permutacion]
+    eje = eje_original[permutacion]
+
+    cambios = np.flatnonzero(np.r_[True, segmento[1:] != segmento[:-1]]) if len(df) else np.array([], dtype=np.int64)
+    longitudes = np.diff(np.r_[cambios, len(df)])
+    inicio = np.repeat(cambios, longitudes)
+    fin = inicio + np.repeat(longitudes, longitudes)
+    identificador = np.repeat(np.arange(len(cambios)), longitudes)
+
+    resultado = df.copy()
+    inversa = np.empty_like(permutacion)
+    inversa[permutacion] = np.arange(len(permutacion))
+    for columna, estrategia in estrategias.items():
+        valores = df[columna].to_numpy()[permutacion]
+        faltantes = pd.isna(valores)
+        if not faltantes.any():
+            continue
+        if estrategia == "lineal":
+            imputados = _lineal(valores, faltantes, eje, inicio, fin)
+        elif estrategia == "moda":
+            imputados = _moda(valores, faltantes, identificador, len(cambios))
+        else:
+            imputados = _tomar(valores, _anterior_valido(~faltantes, inicio))
+        resultado[columna] = _restaurar_tipo(imputados[inversa], df[columna])
+    return resultado
+
+
+def interpolar_por_grupos(df, grupos=None, orden=None):
+    """Interpola linealmente todas las columnas numéricas dentro de cada grupo.
+
+    Solo se usan las columnas de `grupos` y `orden` que existan en `df`, de modo
+    que la misma llamada sirve para conjuntos de datos con distintas columnas.
+
+    Args:
+        df (pd.DataFrame): Datos con valores faltantes.
+        grupos (list, optional): Columnas candidatas para agrupar. Defaults to None.
+        orden (str, optional): Columna candidata para ordenar. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Copia de `df` con las columnas numéricas interpoladas.
+    """
+    grupos = [columna for columna in (grupos or []) if columna in df.columns]
+    orden = orden if orden in df.columns else None
+    numericas = [
+        columna
+        for columna in df.select_dtypes(include="number").columns
+        if columna not in grupos and columna != orden
+    ]
+    return imputar(df, {columna: "lineal" for columna in numericas}, grupos=grupos, orden=orden)
@@ -0,0 +1,293 @@
+"""Generación de reportes en lote sin interfaz de Streamlit.
+
+Procesa muchos archivos CSV en paralelo con las mismas funciones de carga,
+limpieza y gráficos que usan las aplicaciones y escribe, por cada archivo, los
+gráficos en PNG, un reporte HTML y la tabla de estadísticas. Al final escribe
+una tabla resumen con el rendimiento de cada archivo.
+
+Uso:
+    python lote.py enfermedades datos/*.csv --salida reportes --procesos 8
+    python lote.py deforestacion regiones/*.csv
+    python lote.py arqueologia excavaciones/*.csv --formatos png
+"""
+
+import argparse
+import base64
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+
+def _cargar_enfermedades(ruta):
+    import efermedad
+
+    return efermedad.cargar_datos(archivo=ruta)
+
+
+def _cargar_deforestacion(ruta):
+    import theforest
+
+    return theforest.cargar_datos(ruta, None)
+
+
+def _cargar_arqueologia(ruta):
+    import graficos_arqueologia
+
+    return graficos_arqueologia.limpiar_datos(pd.read_csv(ruta)), {}
+
+
+def _graficos_enfermedades():
+    import efermedad
+
+    return [
+        ("mapa_calor", efermedad.figura_mapa_calor, None),
+        ("casos_por_pais", efermedad.figura_casos_por_pais, None),
+        ("series_temporales", efermedad.figura_series_temporales, None),
+        ("tasas_hospitalizacion", efermedad.figura_tasas_hospitalizacion, None),
+    ]
+
+
+def _graficos_deforestacion():
+    import theforest
+
+    return [
+        ("mapa_deforestacion", theforest.figura_mapa_deforestacion, None),
+        ("deforestacion_por_pais", theforest.figura_deforestacion_por_pais, None),
+        ("clusteres", theforest.figura_clusteres, None),
+        ("vegetacion", theforest.figura_torta_vegetacion, None),
+    ]
+
+
+def _graficos_arqueologia():
+    import graficos_arqueologia as ga
+
+    return [
+        ("artefactos_por_cultura", ga.figura_artefactos_por_cultura, None),
+        ("edad_profundidad", ga.figura_edad_profundidad, ["Edad_Aprox_Anios", "Profundidad_Excavación_m"]),
+        ("matriz_correlaciones", ga.figura_matriz_correlaciones, None),
+        ("materiales_por_cultura", ga.figura_materiales_por_cultura, None),
+        ("mapa_artefactos", ga.figura_mapa_artefactos, ["Latitud", "Longitud"]),
+        ("artefactos_por_pais", ga.figura_artefactos_por_pais, ["Latitud", "Longitud"]),
+        ("patrones_por_cultura", ga.figura_patrones_por_cultura, None),
+        ("tendencia_anual", ga.figura_tendencia_anual, None),
+    ]
+
+
+# Análisis disponibles: función de carga (devuelve los datos y sus resúmenes
+# precalculados), lista de gráficos
+# (nombre, función, columnas que no pueden ser nulas) y mapa base.
+ANALISIS = {
+    "enfermedades": (_cargar_enfermedades, _graficos_enfermedades, "URL_PAISES_50M"),
+    "deforestacion": (_cargar_deforestacion, _graficos_deforestacion, "URL_PAISES_50M"),
+    "arqueologia": (_cargar_arqueologia, _graficos_arqueologia, "URL_PAISES_110M"),
+}
+
+
+def _inicializar_trabajador(analisis):
+    """Prepara cada proceso: backend Agg, almacén sin retención y mapa base cargado una vez."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import mapas
+    from almacen import ALMACEN
+
+    # Cada archivo se procesa una sola vez: no hace falta conservarlo en memoria.
+    ALMACEN.memoria_maxima = 0
+    try:
+        mapas.cargar_mapa_mundial(getattr(mapas, ANALISIS[analisis][2]))
+    except Exception:
+        # Sin mapa base solo fallan los gráficos de mapas, no todo el archivo.
+        pass
+
+
+def _reporte_html(titulo, imagenes, tabla, errores):
+    """Construye un reporte HTML autocontenido con imágenes embebidas."""
+    partes = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8">',
+        f"<title>{html.escape(titulo)}</title></head><body>",
+        f"<h1>{html.escape(titulo)}</h1>",
+    ]
+    if tabla is not None:
+        partes.append("<h2>Estadísticas Generales</h2>")
+        partes.append(tabla.to_html(float_format=lambda valor: f"{valor:,.4g}"))
+    for nombre, png in imagenes:
+        codificada = base64.b64encode(png).decode("ascii")
+        partes.append(f"<h2>{html.escape(nombre)}</h2>")
+        partes.append(f'<img src="data:image/png;base64,{codificada}" alt="{html.escape(nombre)}">')
+    if errores:
+        partes.append("<h2>Errores</h2><ul>")
+        partes.extend(f"<li>{html.escape(error)}</li>" for error in errores)
+        partes.append("</ul>")
+    partes.append("</body></html>")
+    return "\n".join(partes)
+
+
+def carpetas_salida(rutas):
+    """Asigna a cada archivo una carpeta de reporte distinta.
+
+    La carpeta es la ruta del archivo, sin extensión, relativa al directorio
+    común de todos los archivos, de modo que `r1/datos.csv` y `r2/datos.csv`
+    se escriben en `r1/datos` y `r2/datos`.
+
+    Args:
+        rutas (list): Rutas de los CSV, sin repetir.
+
+    Returns:
+        dict: Ruta -> carpeta relativa dentro de la salida.
+    """
+    absolutas = [os.path.abspath(ruta) for ruta in rutas]
+    comun = os.path.commonpath([os.path.dirname(ruta) for ruta in absolutas]) if absolutas else ""
+    return {
+        ruta: os.path.splitext(os.path.relpath(absoluta, comun))[0]
+        for ruta, absoluta in zip(rutas, absolutas)
+    }
+
+
+def procesar_archivo(analisis, ruta, carpeta, formatos=("png", "html"), dpi=100):
+    """Carga un archivo, genera sus gráficos y escribe el reporte.
+
+    Un gráfico que falla se registra como error sin detener los demás.
+
+    Args:
+        analisis (str): Clave de `ANALISIS`.
+        ruta (str): Ruta del CSV.
+        carpeta (str): Carpeta del reporte de este archivo.
+        formatos (tuple, optional): "png" y/o "html". Defaults to ("png", "html").
+        dpi (int, optional): Resolución de los PNG. Defaults to 100.
+
+    Returns:
+        dict: Fila de la tabla resumen (archivo, carpeta, filas, segundos, filas/segundo, errores).
+    """
+    from io import BytesIO
+
+    from estadisticas import describir, resumir
+
+    inicio = time.perf_counter()
+    cargar, graficos, _ = ANALISIS[analisis]
+    os.makedirs(carpeta, exist_ok=True)
+
+    errores = []
+    imagenes = []
+    df, extras = cargar(ruta)
+    if df is None:
+        raise ValueError(f"No se pudieron cargar los datos de {ruta}")
+
+    tabla = describir(extras.get("estadisticas") or resumir(df))
+    tabla.to_csv(os.path.join(carpeta, "estadisticas.csv"))
+
+    for nombre, construir, obligatorias in graficos():
+        try:
+            datos = df.dropna(subset=obligatorias) if obligatorias else df
+            if datos.empty:
+                raise ValueError("no hay datos válidos")
+            buffer = BytesIO()
+            construir(datos).savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        except Exception as error:
+            errores.append(f"{nombre}: {error}")
+            continue
+        imagenes.append((nombre, buffer.getvalue()))
+        if "png" in formatos:
+            with open(os.path.join(carpeta, f"{nombre}.png"), "wb") as archivo:
+                archivo.write(buffer.getvalue())
+
+    if "html" in formatos:
+        with open(os.path.join(carpeta, "reporte.html"), "w", encoding="utf-8") as archivo:
+            archivo.write(_reporte_html(ruta, imagenes, tabla, errores))
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "archivo": ruta,
+        "reporte": carpeta,
+        "filas": len(df),
+        "graficos": len(imagenes),
+        "segundos": segundos,
+        "filas_por_segundo": len(df) / segundos if segundos else float("nan"),
+        "errores": "; ".join(errores),
+    }
+
+
+def procesar_lote(analisis, rutas, salida, procesos=None, formatos=("png", "html"), dpi=100):
+    """Procesa muchos archivos en un pool de procesos.
+
+    Cada archivo se escribe en su propia carpeta (ver `carpetas_salida`); los
+    archivos repetidos se procesan una sola vez.
+
+    Args:
+        analisis (str): Clave de `ANALISIS`.
+        rutas (list): Rutas de los CSV.
+        salida (str): Carpeta raíz de los reportes.
+        procesos (int, optional): Procesos del pool. Defaults to None.
+        formatos (tuple, optional): "png" y/o "html". Defaults to ("png", "html").
+        dpi (int, optional): Resolución de los PNG. Defaults to 100.
+
+    Returns:
+        pd.DataFrame: Tabla resumen con una fila por archivo.
+    """
+    os.makedirs(salida, exist_ok=True)
+    rutas = list(dict.fromkeys(os.path.normpath(ruta) for ruta in rutas))
+    carpetas = carpetas_salida(rutas)
+    filas = []
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=procesos, initializer=_inicializar_trabajador, initargs=(analisis,)
+    ) as pool:
+        futuros = {
+            pool.submit(
+                procesar_archivo, analisis, ruta, os.path.join(salida, carpetas[ruta]), tuple(formatos), dpi
+            ): ruta
+            for ruta in rutas
+        }
+        for futuro in as_completed(futuros):
+            ruta = futuros[futuro]
+            try:
+                fila = futuro.result()
+            except Exception as error:
+                fila = {"archivo": ruta, "reporte": os.path.join(salida, carpetas[ruta]), "filas": 0,
+                        "graficos": 0, "segundos": float("nan"), "filas_por_segundo": float("nan"),
+                        "errores": str(error)}
+            filas.append(fila)
+            print(
+                f"[{len(filas)}/{len(rutas)}] {ruta}: {fila['filas']:,} filas en "
+                f"{fila['segundos']:.2f} s ({fila['filas_por_segundo']:,.0f} filas/s)"
+                + (f" — errores: {fila['errores']}" if fila["errores"] else "")
+            )
+
+    resumen = pd.DataFrame(filas).sort_values("archivo").reset_index(drop=True)
+    resumen.to_csv(os.path.join(salida, "resumen.csv"), index=False)
+    total = time.perf_counter() - inicio
+    print(
+        f"{len(rutas)} archivos, {resumen['filas'].sum():,} filas en {total:.2f} s "
+        f"({len(rutas) / total:.2f} archivos/s, {resumen['filas'].sum() / total:,.0f} filas/s)"
+    )
+    return resumen
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera reportes de los tableros en lote, sin Streamlit.")
+    parser.add_argument("analisis", choices=sorted(ANALISIS), help="Análisis a ejecutar.")
+    parser.add_argument("archivos", nargs="+", help="Archivos CSV de entrada.")
+    parser.add_argument("--salida", default="reportes", help="Carpeta de salida (por defecto: reportes).")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto: núcleos).")
+    parser.add_argument(
+        "--formatos", nargs="+", choices=["png", "html"], default=["png", "html"], help="Formatos de salida."
+    )
+    parser.add_argument("--dpi", type=int, default=100, help="Resolución de los PNG.")
+    argumentos = parser.parse_args()
+    procesar_lote(
+        argumentos.analisis,
+        argumentos.archivos,
+        argumentos.salida,
+        procesos=argumentos.procesos,
+        formatos=argumentos.formatos,
+        dpi=argumentos.dpi,
+    )
+
+
+if __name__ == "__main__":
+    main()
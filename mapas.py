@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from matplotlib.figure import Figure
+
+URL_PAISES_50M = "https://naturalearth.s3.amazonaws.com/50m_cultural/ne_50m_admin_0_countries.zip"
+URL_PAISES_110M = (
+    "https://naciscdn.org/naturalearth/110m/cultural/"
+    "ne_110m_admin_0_countries.zip"
+)
+
+# Columna de Natural Earth con el nombre único de cada país
+COLUMNA_NOMBRE = "ADMIN"
+
+# Asignaciones punto -> país guardadas por conjunto de coordenadas
+MAXIMO_ASIGNACIONES = 32
+_asignaciones = OrderedDict()
+_lock_asignaciones = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def cargar_mapa_mundial(url=URL_PAISES_50M):
+    """Descarga el mapa de países una sola vez por proceso.
+
+    El GeoDataFrame devuelto se comparte entre llamadas, así que no debe
+    modificarse.
+
+    Args:
+        url (str, optional): URL del shapefile de Natural Earth. Defaults to URL_PAISES_50M.
+
+    Returns:
+        gpd.GeoDataFrame: Polígonos de los países.
+    """
+    return gpd.read_file(url)
+
+
+def _firma_coordenadas(longitudes, latitudes, url):
+    """Identifica un conjunto de coordenadas por su contenido."""
+    firma = hashlib.sha1(url.encode())
+    firma.update(np.ascontiguousarray(longitudes).tobytes())
+    firma.update(np.ascontiguousarray(latitudes).tobytes())
+    return firma.hexdigest()
+
+
+def asignar_paises(longitudes, latitudes, url=URL_PAISES_50M):
+    """Asigna cada punto al país que lo contiene con una consulta masiva al STRtree.
+
+    Primero se descartan los puntos nulos o fuera de la caja envolvente del
+    mapa y se prueban una sola vez las coordenadas repetidas; luego todos los
+    puntos se consultan a la vez contra el índice espacial del mapa. El
+    resultado se guarda según el contenido de las coordenadas, de modo que
+    volver a pedirlo para el mismo conjunto de datos no repite ninguna prueba
+    geométrica.
+
+    Args:
+        longitudes (array-like): Longitud de cada punto.
+        latitudes (array-like): Latitud de cada punto.
+        url (str, optional): URL del mapa de países. Defaults to URL_PAISES_50M.
+
+    Returns:
+        np.ndarray: Posición del país en el mapa para cada punto, o -1 si el
+        punto no cae en ningún país. No debe modificarse.
+    """
+    longitudes = pd.to_numeric(pd.Series(longitudes), errors="coerce").to_numpy(dtype=float)
+    latitudes = pd.to_numeric(pd.Series(latitudes), errors="coerce").to_numpy(dtype=float)
+    clave = _firma_coordenadas(longitudes, latitudes, url)
+    with _lock_asignaciones:
+        if clave in _asignaciones:
+            _asignaciones.move_to_end(clave)
+            return _asignaciones[clave]
+
+    mundo = cargar_mapa_mundial(url)
+    codigos = np.full(len(longitudes), -1, dtype=np.int32)
+
+    # Prefiltro por caja envolvente: sin geometrías para puntos imposibles
+    minimo_x, minimo_y, maximo_x, maximo_y = mundo.total_bounds
+    candidatos = np.flatnonzero(
+        (longitudes >= minimo_x) & (longitudes <= maximo_x) & (latitudes >= minimo_y) & (latitudes <= maximo_y)
+    )
+
+    # Las coordenadas repetidas se prueban una sola vez
+    unicas, inversa = np.unique(
+        longitudes[candidatos] + 1j * latitudes[candidatos], return_inverse=True
+    )
+    puntos = shapely.points(unicas.real, unicas.imag)
+    entrada, pais = mundo.sindex.query(puntos, predicate="intersects")
+
+    # En fronteras compartidas gana el primer país del mapa
+    orden = np.lexsort((pais, entrada))
+    primeros = np.unique(entrada[orden], return_index=True)[1]
+    por_punto = np.full(len(unicas), -1, dtype=np.int32)
+    por_punto[entrada[orden][primeros]] = pais[orden][primeros]
+    codigos[candidatos] = por_punto[inversa.ravel()]
+    codigos.flags.writeable = False
+
+    with _lock_asignaciones:
+        _asignaciones[clave] = codigos
+        while len(_asignaciones) > MAXIMO_ASIGNACIONES:
+            _asignaciones.popitem(last=False)
+    return codigos
+
+
+def columna_paises(df, url=URL_PAISES_50M):
+    """Devuelve el país de cada fila como una columna categórica.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Latitud' y 'Longitud'.
+        url (str, optional): URL del mapa de países. Defaults to URL_PAISES_50M.
+
+    Returns:
+        pd.Series: Nombre del país de cada fila (nulo si no cae en ninguno).
+    """
+    mundo = cargar_mapa_mundial(url)
+    codigos = asignar_paises(df["Longitud"], df["Latitud"], url)
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=mundo[COLUMNA_NOMBRE].to_numpy()),
+        index=df.index,
+        name="Pais",
+    )
+
+
+def totales_por_pais(df, columna=None, url=URL_PAISES_50M):
+    """Suma una columna (o cuenta filas) por país.
+
+    Si `df` ya trae la columna 'Pais' (ver `columna_paises`) se reutiliza y el
+    cálculo es solo una agrupación.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Pais' o con 'Latitud' y 'Longitud'.
+        columna (str, optional): Columna a sumar. Defaults to None (contar filas).
+        url (str, optional): URL del mapa de países. Defaults to URL_PAISES_50M.
+
+    Returns:
+        pd.Series: Total por nombre de país.
+    """
+    paises = df["Pais"] if "Pais" in df.columns else columna_paises(df, url)
+    valores = df[columna] if columna is not None else pd.Series(1, index=df.index)
+    return valores.groupby(paises, observed=True).sum()
+
+
+def figura_coropletas(totales, titulo, etiqueta, url=URL_PAISES_50M, cmap="OrRd"):
+    """Mapa de coropletas con un total por país.
+
+    Args:
+        totales (pd.Series): Total por nombre de país (ver `totales_por_pais`).
+        titulo (str): Título del mapa.
+        etiqueta (str): Texto de la barra de colores.
+        url (str, optional): URL del mapa de países. Defaults to URL_PAISES_50M.
+        cmap (str, optional): Mapa de colores. Defaults to "OrRd".
+
+    Returns:
+        Figure: Figura con el mapa.
+    """
+    mundo = cargar_mapa_mundial(url)
+    con_totales = mundo[[COLUMNA_NOMBRE, "geometry"]].assign(
+        Total=mundo[COLUMNA_NOMBRE].map(totales).astype(float)
+    )
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    con_totales.plot(
+        ax=ax,
+        column="Total",
+        cmap=cmap,
+        legend=True,
+        legend_kwds={"label": etiqueta, "shrink": 0.6},
+        missing_kwds={"color": "lightgray"},
+        edgecolor="white",
+        linewidth=0.3,
+    )
+    ax.set_title(titulo)
+    ax.set_axis_off()
+    return fig
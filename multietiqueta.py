@@ -0,0 +1,100 @@
+"""Codificación de columnas multietiqueta en matrices dispersas.
+
+Columnas como 'Plagas_Presentes' o 'Enfermedades_Presentes' guardan varias
+etiquetas separadas por comas en un mismo texto. Se analizan una sola vez y se
+convierten en una matriz indicadora dispersa (filas = registros, columnas =
+términos) para que frecuencias, coocurrencias y promedios por etiqueta sean
+productos de matrices en lugar de `str.split().explode()` repetidos.
+"""
+
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# matriz: CSR de forma (registros, términos) con unos donde aparece la etiqueta.
+# terminos: pd.Index con el nombre de cada columna de la matriz.
+CodificacionEtiquetas = namedtuple("CodificacionEtiquetas", ["matriz", "terminos"])
+
+
+def codificar_etiquetas(serie, separador=","):
+    """Convierte una columna de etiquetas separadas en una matriz dispersa.
+
+    Los valores nulos y las etiquetas vacías se ignoran, los espacios se
+    recortan y una etiqueta repetida en el mismo registro se cuenta una vez.
+
+    Args:
+        serie (pd.Series): Columna con textos del tipo "Roya, Mildiu".
+        separador (str, optional): Separador de etiquetas. Defaults to ",".
+
+    Returns:
+        CodificacionEtiquetas: Matriz indicadora y diccionario de términos.
+    """
+    listas = serie.fillna("").astype(str).str.split(separador).tolist()
+    longitudes = np.fromiter((len(lista) for lista in listas), dtype=np.int64, count=len(listas))
+    etiquetas = pd.Series(list(chain.from_iterable(listas)), dtype=object).str.strip()
+    filas = np.repeat(np.arange(len(listas)), longitudes)
+
+    validas = (etiquetas != "").to_numpy()
+    codigos, terminos = pd.factorize(etiquetas[validas], sort=True)
+    matriz = sparse.csr_matrix(
+        (np.ones(len(codigos), dtype=np.int32), (filas[validas], codigos)),
+        shape=(len(listas), len(terminos)),
+    )
+    # Las etiquetas duplicadas en una fila se suman al construir; se dejan en 1.
+    matriz.data[:] = 1
+    return CodificacionEtiquetas(matriz, pd.Index(terminos, name=serie.name))
+
+
+def frecuencias(codificacion):
+    """Cuenta en cuántos registros aparece cada etiqueta.
+
+    Args:
+        codificacion (CodificacionEtiquetas): Resultado de `codificar_etiquetas`.
+
+    Returns:
+        pd.Series: Conteo por etiqueta, de mayor a menor.
+    """
+    conteos = np.asarray(codificacion.matriz.sum(axis=0)).ravel()
+    return pd.Series(conteos, index=codificacion.terminos).sort_values(ascending=False)
+
+
+def coocurrencia(filas, columnas):
+    """Cuenta los registros que comparten cada par de etiquetas.
+
+    Args:
+        filas (CodificacionEtiquetas): Etiquetas de las filas (p. ej. plagas).
+        columnas (CodificacionEtiquetas): Etiquetas de las columnas (p. ej. enfermedades).
+
+    Returns:
+        pd.DataFrame: Matriz de coocurrencias términos × términos.
+    """
+    producto = (filas.matriz.T @ columnas.matriz).toarray()
+    return pd.DataFrame(producto, index=filas.terminos, columns=columnas.terminos)
+
+
+def promedio_por_etiqueta(codificacion, valores):
+    """Calcula el promedio de una variable numérica para cada etiqueta.
+
+    Los registros con valor nulo no cuentan ni en la suma ni en el conteo.
+
+    Args:
+        codificacion (CodificacionEtiquetas): Resultado de `codificar_etiquetas`.
+        valores (pd.Series): Variable numérica alineada con los registros.
+
+    Returns:
+        pd.DataFrame: Columnas 'promedio' y 'registros' por etiqueta.
+    """
+    valores = pd.to_numeric(valores, errors="coerce").to_numpy(dtype=float)
+    validos = ~np.isnan(valores)
+    matriz_t = codificacion.matriz.T.tocsr()
+    sumas = matriz_t @ np.where(validos, valores, 0.0)
+    registros = matriz_t @ validos.astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        promedio = sumas / registros
+    return pd.DataFrame(
+        {"promedio": promedio, "registros": registros.astype(np.int64)},
+        index=codificacion.terminos,
+    )
@@ -1,6 +1,13 @@
 import streamlit as st
-import re
-import random
+from io import BytesIO, StringIO
+
+from corpus_poemas import (
+    cargar_indice,
+    construir_indice,
+    escribir_poemas,
+    generar_poemas,
+    guardar_indice,
+)
 
 # Título de la aplicación
 st.title('Generador de Poemas Aleatorios con Regex por Santiago Vanegas')
@@ -16,27 +23,79 @@ entrada = st.text_area('Escribe algo que te inspire (pueden ser palabras o frase
 
 # Función para generar un poema basado en la entrada
 def generar_poema(texto):
-    # Usamos expresiones regulares para encontrar palabras que empiecen con una letra mayúscula
-    palabras_mayus = re.findall(r'\b[A-Z][a-z]*\b', texto)
-    # Encontramos las palabras que terminan en "o" o "a"
-    palabras_terminadas = re.findall(r'\b\w+[oa]\b', texto)
-    # Generamos algunas frases aleatorias con patrones
-    lineas_poeticas = [
-        f"El viento susurra sobre {random.choice(palabras_mayus)}.",
-        f"{random.choice(palabras_terminadas)} florecen a la luz de la luna.",
-        f"¿Quién puede comprender el suspiro de {random.choice(palabras_terminadas)}?",
-        f"La sombra de {random.choice(palabras_mayus)} danza en el atardecer.",
-        f"Y así, {random.choice(palabras_terminadas)} van cayendo como estrellas perdidas."
-    ]
-    # Combinamos las líneas generadas en un poema
-    poema = "\n".join(lineas_poeticas)
-    return poema
+    # Tokenizamos el texto una sola vez en grupos de palabras (mayúscula inicial y terminadas en "o"/"a")
+    indice = construir_indice(texto)
+    # Elegimos palabras al azar de cada grupo y las combinamos en un poema
+    return next(generar_poemas(indice, 1))
 
 # Si hay entrada de texto, generamos un poema
 if entrada:
-    poema_generado = generar_poema(entrada)
-    st.write("### Tu poema aleatorio:")
-    st.text(poema_generado)
+    try:
+        poema_generado = generar_poema(entrada)
+    except ValueError as error:
+        st.warning(f"No se pudo generar el poema: {error}")
+    else:
+        st.write("### Tu poema aleatorio:")
+        st.text(poema_generado)
 else:
     st.write("¡Escribe algo para generar tu poema!")
 
+# Modo corpus: indexar un libro completo y generar muchos poemas
+MAXIMO_POEMAS = 100_000
+
+st.write("## Modo corpus")
+st.write("""
+Sube un libro en texto plano (o un índice guardado) para generar miles de poemas de una vez.
+El texto se indexa una sola vez y los poemas se descargan en un archivo.
+""")
+
+@st.cache_data
+def indice_desde_texto(contenido):
+    return construir_indice(contenido.decode("utf-8", errors="ignore"))
+
+@st.cache_data
+def indice_desde_archivo(contenido):
+    return cargar_indice(BytesIO(contenido))
+
+corpus = st.file_uploader("Libro (.txt) o índice guardado (.npz)", type=["txt", "npz"])
+if corpus is not None:
+    if corpus.name.endswith(".npz"):
+        indice = indice_desde_archivo(corpus.getvalue())
+    else:
+        indice = indice_desde_texto(corpus.getvalue())
+
+    st.write(f"Vocabulario indexado: **{len(indice.vocabulario):,}** palabras distintas.")
+
+    def indice_en_bytes():
+        # El índice se comprime solo al hacer clic, no en cada ejecución
+        indice_guardado = BytesIO()
+        guardar_indice(indice, indice_guardado)
+        return indice_guardado.getvalue()
+
+    st.download_button("Descargar índice", indice_en_bytes, file_name="indice_poemas.npz")
+
+    # Streamlit entrega la descarga desde memoria, así que la cantidad se
+    # limita para que el archivo quepa en memoria (~250 bytes por poema)
+    cantidad = st.number_input(
+        "Cantidad de poemas",
+        min_value=1,
+        max_value=MAXIMO_POEMAS,
+        value=1_000,
+        help=f"Hasta {MAXIMO_POEMAS:,} poemas (unos 25 MB) por descarga.",
+    )
+    semilla = st.number_input("Semilla", min_value=0, value=0)
+    silabas = st.number_input("Sílabas por palabra (0 = cualquiera)", min_value=0, max_value=20, value=0)
+
+    try:
+        # Verificar que hay palabras de cada grupo antes de ofrecer la descarga
+        next(generar_poemas(indice, 1, silabas=int(silabas) or None))
+    except ValueError as error:
+        st.warning(f"No se pudieron generar los poemas: {error}")
+    else:
+        def poemas_en_texto():
+            # Se ejecuta solo al hacer clic, en un hilo aparte del script
+            salida = StringIO()
+            escribir_poemas(indice, int(cantidad), salida, semilla=int(semilla), silabas=int(silabas) or None)
+            return salida.getvalue()
+
+        st.download_button("Generar y descargar poemas", poemas_en_texto, file_name="poemas.txt", mime="text/plain")
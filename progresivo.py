@@ -0,0 +1,205 @@
+"""Renderizado progresivo de gráficos para conjuntos de datos grandes.
+
+Cuando el gráfico exacto no está listo dentro del presupuesto de latencia, se
+muestra primero una vista previa construida con una muestra estratificada y
+marcada como aproximada; el cálculo exacto sigue en un hilo en segundo plano y
+reemplaza a la vista previa cuando termina.
+
+La muestra se calcula una sola vez al cargar los datos (`muestra_estratificada`)
+y se reutiliza en todos los gráficos. Dentro de `pagina_progresiva` todos los
+gráficos de la página comparten un mismo presupuesto: se dibujan primero todas
+las vistas previas y los gráficos exactos se colocan al final de la página, a
+medida que terminan.
+
+Las funciones que construyen los gráficos deben usar la API orientada a
+objetos de matplotlib (`matplotlib.figure.Figure`) y no `pyplot`, porque la
+vista previa y el gráfico exacto se construyen al mismo tiempo en hilos
+distintos. Si aceptan un parámetro `escala`, reciben el factor por el que hay
+que multiplicar conteos y sumas calculados sobre la muestra.
+"""
+
+import inspect
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TAMANO_MUESTRA = 5_000
+PRESUPUESTO_SEGUNDOS = 0.5
+
+_ejecutor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="grafico-exacto")
+
+# Página progresiva activa en el hilo del script de cada sesión
+_local = threading.local()
+
+
+def muestra_estratificada(df, estratos=None, tamano=TAMANO_MUESTRA, semilla=0):
+    """Toma una muestra aleatoria estratificada con asignación proporcional.
+
+    Cada fila recibe una clave aleatoria y en cada estrato se conservan las
+    filas con las claves más pequeñas (muestreo de reservorio por claves), de
+    modo que cada estrato queda representado en proporción a su tamaño. Como
+    todos los estratos se muestrean con la misma fracción, los conteos de la
+    muestra se extrapolan con un único factor; los estratos demasiado pequeños
+    para recibir una fila no aparecen en la vista previa. Si ningún estrato
+    recibe filas se devuelve una muestra aleatoria simple.
+
+    Recorre y ordena todo el conjunto de datos, así que conviene calcularla
+    una sola vez al cargar los datos.
+
+    Args:
+        df (pd.DataFrame): Datos de entrada.
+        estratos (list, optional): Columnas que definen los estratos; se
+            ignoran las que no existan en `df`. Defaults to None.
+        tamano (int, optional): Tamaño aproximado de la muestra. Defaults to TAMANO_MUESTRA.
+        semilla (int, optional): Semilla del generador aleatorio. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Filas muestreadas, en su orden original.
+    """
+    if len(df) <= tamano:
+        return df
+    claves = pd.Series(np.random.default_rng(semilla).random(len(df)), index=df.index)
+    estratos = [columna for columna in (estratos or []) if columna in df.columns]
+    if not estratos:
+        return df[claves.rank(method="first") <= tamano]
+
+    grupos = [df[columna] for columna in estratos]
+    tamanos = claves.groupby(grupos, dropna=False).transform("size")
+    cuota = np.round(tamanos * tamano / len(df))
+    rango = claves.groupby(grupos, dropna=False).rank(method="first")
+    muestra = df[rango <= cuota]
+    # Con muchos estratos diminutos todas las cuotas se redondean a cero
+    if muestra.empty:
+        return df[claves.rank(method="first") <= tamano]
+    return muestra
+
+
+def _construir(construir, df, escala):
+    """Llama a la función de gráfico pasando `escala` solo si la acepta."""
+    if "escala" in inspect.signature(construir).parameters:
+        return construir(df, escala=escala)
+    return construir(df)
+
+
+def _mostrar_exacto(contenedor, exacto):
+    """Reemplaza la vista previa por el gráfico exacto, o por su error.
+
+    Un gráfico que falla no debe impedir que se muestren los demás de la página.
+    """
+    try:
+        figura = exacto.result()
+    except Exception as error:
+        contenedor.error(f"No se pudo generar el gráfico: {error}")
+    else:
+        contenedor.pyplot(figura)
+
+
+@contextmanager
+def pagina_progresiva(presupuesto=PRESUPUESTO_SEGUNDOS):
+    """Agrupa los gráficos progresivos de una página.
+
+    Los gráficos exactos que no terminan dentro del presupuesto no bloquean a
+    los siguientes: al salir del bloque se reemplaza cada vista previa en
+    cuanto termina su gráfico exacto, en el orden en que terminan. Un gráfico
+    que falla muestra su error sin detener a los demás, y si la página se
+    interrumpe se cancelan los gráficos exactos que aún no empezaron.
+
+    Args:
+        presupuesto (float, optional): Segundos, contados desde el inicio de
+            la página, que se espera a los gráficos exactos antes de mostrar
+            vistas previas. Defaults to PRESUPUESTO_SEGUNDOS.
+    """
+    anterior = getattr(_local, "pagina", None)
+    pendientes = []
+    _local.pagina = {"limite": time.monotonic() + presupuesto, "pendientes": pendientes}
+    completo = False
+    try:
+        yield
+        completo = True
+    finally:
+        _local.pagina = anterior
+        if not completo:
+            # La página se interrumpió (error, rerun o stop): los gráficos
+            # exactos pendientes no deben ocupar el ejecutor de la siguiente.
+            for _, exacto in pendientes:
+                exacto.cancel()
+
+    contenedores = {exacto: contenedor for contenedor, exacto in pendientes}
+    try:
+        for exacto in as_completed(contenedores):
+            _mostrar_exacto(contenedores[exacto], exacto)
+    finally:
+        for exacto in contenedores:
+            exacto.cancel()
+
+
+def mostrar_progresivo(
+    construir,
+    df,
+    estratos=None,
+    muestra=None,
+    tamano_muestra=TAMANO_MUESTRA,
+    presupuesto=PRESUPUESTO_SEGUNDOS,
+):
+    """Muestra un gráfico en Streamlit de forma progresiva.
+
+    Dentro de `pagina_progresiva` la función vuelve en cuanto dibuja la vista
+    previa; fuera de ella espera al gráfico exacto.
+
+    Args:
+        construir (callable): Recibe un DataFrame y devuelve una figura.
+        df (pd.DataFrame): Datos completos.
+        estratos (list, optional): Columnas para estratificar la muestra si no
+            se pasa `muestra`. Defaults to None.
+        muestra (pd.DataFrame, optional): Muestra estratificada de `df`
+            calculada de antemano. Defaults to None (se calcula al momento).
+        tamano_muestra (int, optional): Filas de la vista previa. Defaults to TAMANO_MUESTRA.
+        presupuesto (float, optional): Segundos que se espera al gráfico exacto
+            antes de mostrar la vista previa, fuera de `pagina_progresiva`.
+            Defaults to PRESUPUESTO_SEGUNDOS.
+    """
+    pagina = getattr(_local, "pagina", None)
+    contenedor = st.empty()
+    if len(df) <= tamano_muestra:
+        exacto = Future()
+        try:
+            exacto.set_result(_construir(construir, df, 1.0))
+        except Exception as error:
+            exacto.set_exception(error)
+    else:
+        exacto = _ejecutor.submit(_construir, construir, df, 1.0)
+        if pagina is not None:
+            presupuesto = max(0.0, pagina["limite"] - time.monotonic())
+        try:
+            exacto.result(timeout=presupuesto)
+        except TimeoutError:
+            if muestra is None or muestra.empty:
+                muestra = muestra_estratificada(df, estratos, tamano_muestra)
+            try:
+                previa = _construir(construir, muestra, len(df) / len(muestra))
+            except Exception:
+                # Sin vista previa se espera al gráfico exacto, que mostrará su error
+                contenedor.caption("⏳ El gráfico se mostrará al terminar el cálculo.")
+            else:
+                with contenedor.container():
+                    st.pyplot(previa)
+                    st.caption(
+                        f"⏳ Vista previa aproximada con {len(muestra):,} de {len(df):,} filas; "
+                        "el gráfico exacto se mostrará al terminar el cálculo."
+                    )
+            if pagina is not None:
+                pagina["pendientes"].append((contenedor, exacto))
+                return
+        except Exception:
+            # El error se muestra en el contenedor o, fuera de una página, se propaga
+            pass
+
+    if pagina is not None:
+        _mostrar_exacto(contenedor, exacto)
+    else:
+        contenedor.pyplot(exacto.result())
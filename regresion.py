@@ -0,0 +1,223 @@
+"""Ajustes de regresión lineal con bandas de confianza analíticas.
+
+Reemplaza el bootstrap de `seaborn.regplot` (1000 remuestreos por gráfico)
+por fórmulas cerradas sobre estadísticos suficientes: con n, medias y sumas
+de cuadrados centradas se obtienen la recta de mínimos cuadrados, la banda de
+confianza de la media y el coeficiente de Pearson. Los estadísticos de cada
+par de columnas se calculan una sola vez y se pueden reutilizar en varios
+gráficos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+Suficientes = namedtuple(
+    "Suficientes",
+    ["n", "media_x", "media_y", "sxx", "syy", "sxy", "x_min", "x_max", "spearman"],
+)
+
+Ajuste = namedtuple("Ajuste", ["pendiente", "intercepto", "pearson", "p_valor", "spearman", "n"])
+
+
+def estadisticos_suficientes(x, y):
+    """Calcula los estadísticos suficientes de un par de variables.
+
+    Se descartan las filas en las que falta alguno de los dos valores.
+
+    Args:
+        x (array-like): Variable independiente.
+        y (array-like): Variable dependiente.
+
+    Returns:
+        Suficientes: Conteo, medias, sumas de cuadrados centradas, rango de x
+        y coeficiente de Spearman.
+    """
+    x = pd.to_numeric(pd.Series(x), errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype=float)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[validos], y[validos]
+    n = len(x)
+    if n == 0:
+        return Suficientes(0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan)
+
+    media_x, media_y = x.mean(), y.mean()
+    dx, dy = x - media_x, y - media_y
+    rango_x = stats.rankdata(x)
+    rango_y = stats.rankdata(y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spearman = np.corrcoef(rango_x, rango_y)[0, 1] if n > 1 else np.nan
+    return Suficientes(
+        n, media_x, media_y, dx @ dx, dy @ dy, dx @ dy, x.min(), x.max(), spearman
+    )
+
+
+def ajustar(suficientes):
+    """Obtiene la recta de mínimos cuadrados y las correlaciones.
+
+    Args:
+        suficientes (Suficientes): Estadísticos del par de variables.
+
+    Returns:
+        Ajuste: Pendiente, intercepto, Pearson con su p-valor, Spearman y n.
+    """
+    n = suficientes.n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pendiente = suficientes.sxy / suficientes.sxx
+        intercepto = suficientes.media_y - pendiente * suficientes.media_x
+        pearson = suficientes.sxy / np.sqrt(suficientes.sxx * suficientes.syy)
+        if n > 2 and abs(pearson) < 1:
+            estadistico_t = pearson * np.sqrt((n - 2) / (1 - pearson**2))
+            p_valor = 2 * stats.t.sf(abs(estadistico_t), n - 2)
+        elif n > 2 and abs(pearson) == 1:
+            p_valor = 0.0
+        else:
+            p_valor = np.nan
+    return Ajuste(pendiente, intercepto, pearson, p_valor, suficientes.spearman, n)
+
+
+def banda_confianza(suficientes, x, nivel=0.95):
+    """Calcula la recta ajustada y la banda de confianza de la media.
+
+    Args:
+        suficientes (Suficientes): Estadísticos del par de variables.
+        x (np.ndarray): Puntos donde evaluar la recta.
+        nivel (float, optional): Nivel de confianza. Defaults to 0.95.
+
+    Returns:
+        tuple: Arreglos (y_ajustada, limite_inferior, limite_superior).
+    """
+    ajuste = ajustar(suficientes)
+    y = ajuste.intercepto + ajuste.pendiente * x
+    n = suficientes.n
+    if n <= 2:
+        return y, np.full_like(y, np.nan), np.full_like(y, np.nan)
+    residuo = max(suficientes.syy - suficientes.sxy**2 / suficientes.sxx, 0.0)
+    error_estandar = np.sqrt(residuo / (n - 2))
+    margen = (
+        stats.t.ppf((1 + nivel) / 2, n - 2)
+        * error_estandar
+        * np.sqrt(1 / n + (x - suficientes.media_x) ** 2 / suficientes.sxx)
+    )
+    return y, y - margen, y + margen
+
+
+def lowess_agrupado(x, y, bins=100, fraccion=2 / 3, puntos=100):
+    """Suavizado LOWESS aproximado sobre una muestra agrupada en intervalos.
+
+    Los datos se resumen en `bins` intervalos de x (media de x, media de y y
+    conteo) y la regresión local ponderada con pesos tricúbicos se hace sobre
+    esos intervalos, así que el costo no depende del número de filas.
+
+    Args:
+        x (array-like): Variable independiente.
+        y (array-like): Variable dependiente.
+        bins (int, optional): Número de intervalos. Defaults to 100.
+        fraccion (float, optional): Fracción de los datos en cada vecindad. Defaults to 2/3.
+        puntos (int, optional): Puntos de la curva resultante. Defaults to 100.
+
+    Returns:
+        tuple: Arreglos (x_curva, y_curva).
+    """
+    x = pd.to_numeric(pd.Series(x), errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype=float)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[validos], y[validos]
+    if len(x) == 0:
+        return np.array([]), np.array([])
+
+    bordes = np.linspace(x.min(), x.max(), bins + 1)
+    indice = np.clip(np.searchsorted(bordes, x, side="right") - 1, 0, bins - 1)
+    conteo = np.bincount(indice, minlength=bins).astype(float)
+    ocupados = conteo > 0
+    centro_x = np.bincount(indice, weights=x, minlength=bins)[ocupados] / conteo[ocupados]
+    centro_y = np.bincount(indice, weights=y, minlength=bins)[ocupados] / conteo[ocupados]
+    conteo = conteo[ocupados]
+
+    x_curva = np.linspace(x.min(), x.max(), puntos)
+    distancia = np.abs(x_curva[:, None] - centro_x[None, :])
+    # Radio de cada vecindad: distancia que acumula la fracción pedida de filas.
+    orden = np.argsort(distancia, axis=1)
+    acumulado = np.cumsum(conteo[orden], axis=1)
+    limite = np.argmax(acumulado >= fraccion * conteo.sum(), axis=1)
+    radio = np.take_along_axis(distancia, orden, axis=1)[np.arange(puntos), limite]
+    radio = np.where(radio > 0, radio, 1.0)
+
+    pesos = conteo * np.clip(1 - (distancia / radio[:, None]) ** 3, 0, None) ** 3
+    suma_pesos = pesos.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media_x = (pesos * centro_x).sum(axis=1) / suma_pesos
+        media_y = (pesos * centro_y).sum(axis=1) / suma_pesos
+        dx = centro_x[None, :] - media_x[:, None]
+        dy = centro_y[None, :] - media_y[:, None]
+        pendiente = (pesos * dx * dy).sum(axis=1) / (pesos * dx * dx).sum(axis=1)
+    pendiente = np.where(np.isfinite(pendiente), pendiente, 0.0)
+    return x_curva, media_y + pendiente * (x_curva - media_x)
+
+
+def dibujar_regresion(
+    ax,
+    df,
+    x,
+    y,
+    suficientes=None,
+    scatter=True,
+    color=None,
+    scatter_kws=None,
+    nivel=0.95,
+    lowess=False,
+    mostrar_coeficientes=True,
+):
+    """Dibuja una regresión con el mismo aspecto que `sns.regplot`.
+
+    Args:
+        ax (matplotlib.axes.Axes): Ejes donde dibujar.
+        df (pd.DataFrame): Datos de entrada.
+        x (str): Columna independiente.
+        y (str): Columna dependiente.
+        suficientes (Suficientes, optional): Estadísticos precalculados del
+            par; si es None se calculan. Defaults to None.
+        scatter (bool, optional): Dibujar los puntos. Defaults to True.
+        color (str, optional): Color de puntos, recta y banda. Defaults to None.
+        scatter_kws (dict, optional): Argumentos extra de `ax.scatter`. Defaults to None.
+        nivel (float, optional): Nivel de confianza de la banda. Defaults to 0.95.
+        lowess (bool, optional): Usar LOWESS agrupado en lugar de la recta. Defaults to False.
+        mostrar_coeficientes (bool, optional): Anotar Pearson y Spearman. Defaults to True.
+
+    Returns:
+        Ajuste: Resultado del ajuste lineal.
+    """
+    if suficientes is None:
+        suficientes = estadisticos_suficientes(df[x], df[y])
+    if color is None:
+        color = ax._get_lines.get_next_color()
+
+    if scatter:
+        opciones = {"s": 20, "linewidths": 0, **(scatter_kws or {})}
+        ax.scatter(df[x], df[y], color=color, **opciones)
+
+    ajuste = ajustar(suficientes)
+    if lowess:
+        curva_x, curva_y = lowess_agrupado(df[x], df[y])
+        ax.plot(curva_x, curva_y, color=color, linewidth=2)
+    elif suficientes.n > 1:
+        malla = np.linspace(suficientes.x_min, suficientes.x_max, 100)
+        recta, inferior, superior = banda_confianza(suficientes, malla, nivel)
+        ax.plot(malla, recta, color=color, linewidth=2)
+        ax.fill_between(malla, inferior, superior, color=color, alpha=0.15, linewidth=0)
+
+    if mostrar_coeficientes:
+        ax.text(
+            0.02,
+            0.98,
+            f"Pearson r = {ajuste.pearson:.2f}\nSpearman ρ = {ajuste.spearman:.2f}",
+            transform=ax.transAxes,
+            va="top",
+            fontsize=9,
+            bbox={"boxstyle": "round", "facecolor": "white", "alpha": 0.7},
+        )
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return ajuste
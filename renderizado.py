@@ -0,0 +1,232 @@
+"""Renderizado en paralelo de gráficos de matplotlib a PNG.
+
+Cada gráfico se construye en un proceso independiente con el backend Agg a
+partir de una vista de solo lectura del DataFrame publicada en memoria
+compartida, de modo que la latencia total se aproxima a la del gráfico más
+lento en lugar de la suma de todos.
+"""
+
+import inspect
+import pickle
+import threading
+import uuid
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+
+ResultadoGrafico = namedtuple("ResultadoGrafico", ["nombre", "png", "error"])
+
+# Tipos de columna que se pueden compartir sin copiar (bool, enteros,
+# flotantes, complejos y fechas de numpy).
+_TIPOS_COMPARTIBLES = "biufcmM"
+
+_pool = None
+_pool_trabajadores = None
+_pool_lock = threading.Lock()
+
+# Estado de cada proceso trabajador: último DataFrame adjuntado.
+_vista = {"token": None, "df": None, "extras": None, "segmentos": []}
+
+
+def _publicar(df, extras):
+    """Copia el DataFrame a segmentos de memoria compartida.
+
+    Las columnas numéricas y de fechas se copian a un segmento propio; el
+    resto de columnas, el índice y los datos extra se serializan una sola vez
+    en otro segmento.
+
+    Args:
+        df (pd.DataFrame): DataFrame a publicar.
+        extras (dict): Objetos adicionales compartidos por todos los gráficos.
+
+    Returns:
+        tuple: Descriptor serializable y lista de segmentos creados.
+    """
+    segmentos = []
+    columnas = []
+    resto = {}
+    for posicion, (nombre, serie) in enumerate(df.items()):
+        dtype = serie.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in _TIPOS_COMPARTIBLES:
+            valores = np.ascontiguousarray(serie.to_numpy())
+            shm = shared_memory.SharedMemory(create=True, size=max(valores.nbytes, 1))
+            np.ndarray(valores.shape, dtype=valores.dtype, buffer=shm.buf)[:] = valores
+            segmentos.append(shm)
+            columnas.append((posicion, nombre, shm.name, valores.dtype.str, len(valores)))
+        else:
+            resto[posicion] = (nombre, serie)
+
+    datos_resto = pickle.dumps((df.index, resto, extras), protocol=pickle.HIGHEST_PROTOCOL)
+    shm = shared_memory.SharedMemory(create=True, size=len(datos_resto))
+    shm.buf[: len(datos_resto)] = datos_resto
+    segmentos.append(shm)
+
+    descriptor = {
+        "token": uuid.uuid4().hex,
+        "columnas": columnas,
+        "resto": (shm.name, len(datos_resto)),
+    }
+    return descriptor, segmentos
+
+
+def _liberar(segmentos):
+    """Cierra y elimina los segmentos de memoria compartida."""
+    for shm in segmentos:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _adjuntar(descriptor):
+    """Reconstruye en el trabajador una vista de solo lectura del DataFrame.
+
+    La vista se conserva mientras el token no cambie, así que cada proceso
+    adjunta los segmentos una sola vez por lote de gráficos.
+
+    Args:
+        descriptor (dict): Descriptor generado por `_publicar`.
+
+    Returns:
+        tuple: DataFrame respaldado por la memoria compartida y datos extra.
+    """
+    if _vista["token"] == descriptor["token"]:
+        return _vista["df"], _vista["extras"]
+
+    for shm in _vista["segmentos"]:
+        shm.close()
+    _vista.update(token=None, df=None, extras=None, segmentos=[])
+
+    segmentos = []
+    columnas = {}
+    for posicion, nombre, nombre_shm, dtype, longitud in descriptor["columnas"]:
+        shm = shared_memory.SharedMemory(name=nombre_shm)
+        segmentos.append(shm)
+        valores = np.ndarray((longitud,), dtype=np.dtype(dtype), buffer=shm.buf)
+        valores.flags.writeable = False
+        columnas[posicion] = (nombre, valores)
+
+    nombre_shm, longitud = descriptor["resto"]
+    shm = shared_memory.SharedMemory(name=nombre_shm)
+    indice, resto, extras = pickle.loads(bytes(shm.buf[:longitud]))
+    shm.close()
+    columnas.update(resto)
+
+    nombres = [columnas[posicion][0] for posicion in sorted(columnas)]
+    df = pd.DataFrame(
+        {posicion: columnas[posicion][1] for posicion in sorted(columnas)},
+        index=indice,
+        copy=False,
+    )
+    df.columns = nombres
+
+    _vista.update(token=descriptor["token"], df=df, extras=extras, segmentos=segmentos)
+    return df, extras
+
+
+def _inicializar_trabajador():
+    """Fija el backend Agg en cada proceso trabajador."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _renderizar(descriptor, funcion, dpi):
+    """Construye un gráfico en el trabajador y lo devuelve como PNG.
+
+    Solo se pasan a la función los datos extra que declara como parámetros.
+
+    Args:
+        descriptor (dict): Descriptor del DataFrame compartido.
+        funcion (callable): Función que recibe el DataFrame y devuelve una figura.
+        dpi (int): Resolución del PNG.
+
+    Returns:
+        bytes: Imagen PNG del gráfico.
+    """
+    import matplotlib.pyplot as plt
+
+    df, extras = _adjuntar(descriptor)
+    parametros = inspect.signature(funcion).parameters
+    argumentos = {clave: valor for clave, valor in extras.items() if clave in parametros}
+    fig = funcion(df.copy(deep=False), **argumentos)
+    try:
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _obtener_pool(max_trabajadores):
+    """Devuelve el pool de procesos compartido, creándolo si hace falta."""
+    global _pool, _pool_trabajadores
+    with _pool_lock:
+        if _pool is None or _pool_trabajadores != max_trabajadores:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(
+                max_workers=max_trabajadores,
+                mp_context=get_context("spawn"),
+                initializer=_inicializar_trabajador,
+            )
+            _pool_trabajadores = max_trabajadores
+        return _pool
+
+
+def _descartar_pool(pool):
+    """Descarta el pool si quedó inutilizable tras la caída de un trabajador."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def renderizar_graficos(df, graficos, extras=None, max_trabajadores=None, dpi=100):
+    """Renderiza varios gráficos en paralelo a partir del mismo DataFrame.
+
+    Las funciones de `graficos` deben estar definidas a nivel de módulo (para
+    poder enviarlas a otro proceso), recibir el DataFrame sin modificarlo y
+    devolver una figura de matplotlib. Un gráfico que falla no bloquea a los
+    demás: su error se devuelve en el resultado correspondiente.
+
+    Los objetos de `extras` (por ejemplo, codificaciones precalculadas) se
+    serializan una sola vez junto con el DataFrame y se pasan como argumento
+    con nombre a las funciones que declaran un parámetro con esa clave.
+
+    Args:
+        df (pd.DataFrame): Datos de entrada; se publican una sola vez.
+        graficos (list): Pares (nombre, función) a renderizar.
+        extras (dict, optional): Datos adicionales compartidos. Defaults to None.
+        max_trabajadores (int, optional): Procesos del pool. Defaults to None.
+        dpi (int, optional): Resolución de los PNG. Defaults to 100.
+
+    Returns:
+        list[ResultadoGrafico]: Un resultado por gráfico, en el mismo orden.
+    """
+    descriptor, segmentos = _publicar(df, extras or {})
+    try:
+        pool = _obtener_pool(max_trabajadores)
+        futuros = [
+            (nombre, pool.submit(_renderizar, descriptor, funcion, dpi))
+            for nombre, funcion in graficos
+        ]
+        resultados = []
+        for nombre, futuro in futuros:
+            try:
+                resultados.append(ResultadoGrafico(nombre, futuro.result(), None))
+            except BrokenProcessPool as error:
+                _descartar_pool(pool)
+                resultados.append(ResultadoGrafico(nombre, None, error))
+            except Exception as error:
+                resultados.append(ResultadoGrafico(nombre, None, error))
+        return resultados
+    finally:
+        _liberar(segmentos)
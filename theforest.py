@@ -1,9 +1,21 @@
+from functools import partial
+
 import streamlit as st
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import geopandas as gpd
-from shapely.geometry import Point
+from matplotlib.figure import Figure
+
+from almacen import ALMACEN, clave_fuente, mascara_rangos
+from estadisticas import describir, leer_csv, resumir
+from imputacion import interpolar_por_grupos
+from mapas import URL_PAISES_50M, cargar_mapa_mundial, columna_paises, figura_coropletas, totales_por_pais
+from progresivo import muestra_estratificada, mostrar_progresivo, pagina_progresiva
+
+# Columnas para estratificar las vistas previas de datos grandes
+ESTRATOS = ["Region", "Tipo_Vegetacion"]
+
+# Columnas que usa el mapa de deforestación
+COLUMNAS_MAPA = ["Latitud", "Longitud", "Superficie_Deforestada"]
 
 
 def cargar_datos(archivo, url):
@@ -14,32 +26,88 @@ def cargar_datos(archivo, url):
         url (str): URL proporcionada por el usuario.
 
     Returns:
-        pd.DataFrame: DataFrame con los datos cargados e interpolados.
+        tuple: Vista de solo lectura de los datos cargados e interpolados por
+        grupo (o None) y los datos precalculados al cargarlos: "estadisticas"
+        y "muestra".
     """
-    if archivo is not None:
-        df = pd.read_csv(archivo)
-    elif url:
-        df = pd.read_csv(url)
-    else:
+    if archivo is None and not url:
         st.warning("Por favor, carga un archivo o proporciona una URL.")
-        return None
+        return None, {}
 
-    # Interpolar datos en blanco
-    df = df.interpolate(method="linear")
-    return df
+    def leer_y_limpiar():
+        # Resumen estadístico calculado por bloques durante la lectura
+        df, resumenes = leer_csv(archivo if archivo is not None else url)
 
+        # Interpolar datos en blanco dentro de cada región y tipo de vegetación
+        df = interpolar_por_grupos(df, grupos=["Region", "Tipo_Vegetacion"], orden="Fecha")
 
-def mostrar_estadisticas(df):
+        # Muestra para las vistas previas, compartida por todos los gráficos
+        return df, {"estadisticas": resumenes, "muestra": muestra_estratificada(df, ESTRATOS)}
+
+    # Datos limpios compartidos por todas las sesiones que abren la misma fuente
+    clave = clave_fuente("theforest", archivo=archivo, url=url)
+    return ALMACEN.obtener(clave, leer_y_limpiar, persistir=archivo is not None)
+
+
+def mostrar_estadisticas(df, resumenes=None):
     """Muestra estadísticas generales del dataset."""
     st.write("### Estadísticas Generales")
-    st.write(df.describe())
+    resumenes = resumenes or resumir(df)
+    st.write(describir(resumenes))
+    if resumenes:
+        error = max(resumen.error_rango for resumen in resumenes.values())
+        st.caption(
+            f"Calculadas al leer el archivo, antes de la interpolación. "
+            f"Los percentiles son aproximados (error de rango de ±{error:.1%})."
+        )
+
+
+def figura_mapa_deforestacion(df):
+    """Construye el mapa de zonas deforestadas.
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas 'Latitud', 'Longitud', 'Superficie_Deforestada'.
+
+    Returns:
+        Figure: Figura con el mapa.
+    """
+    world = cargar_mapa_mundial(URL_PAISES_50M)
+    gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df["Longitud"], df["Latitud"]))
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    world.plot(ax=ax, color="lightgray")
+    gdf.plot(
+        ax=ax, column="Superficie_Deforestada", legend=True, cmap="Reds", markersize=5
+    )
+    return fig
+
 
+def figura_deforestacion_por_pais(df, escala=1.0, completo=None):
+    """Construye el mapa de coropletas con la superficie deforestada por país.
+
+    Args:
+        df (pd.DataFrame): DataFrame con 'Superficie_Deforestada' y 'Pais' (o 'Latitud' y 'Longitud').
+        escala (float, optional): Factor para extrapolar sumas de una muestra. Defaults to 1.0.
+        completo (pd.DataFrame, optional): Datos sin filtrar de los que `df`
+            es un subconjunto. El país se asigna una sola vez sobre ellos,
+            quedando guardado para ese conjunto, y se recorta a las filas de
+            `df`. Defaults to None (se asigna sobre `df`).
 
-def mostrar_mapa_deforestacion(df):
+    Returns:
+        Figure: Figura con el mapa.
+    """
+    if completo is not None and "Pais" not in df.columns:
+        df = df.assign(Pais=columna_paises(completo))
+    totales = totales_por_pais(df, "Superficie_Deforestada") * escala
+    return figura_coropletas(totales, "Superficie Deforestada por País", "Superficie deforestada", cmap="Reds")
+
+
+def mostrar_mapa_deforestacion(df, muestra=None):
     """Genera un mapa con las zonas de deforestación usando imágenes satelitales.
 
     Args:
         df (pd.DataFrame): DataFrame con las columnas 'Latitud', 'Longitud', 'Superficie_Deforestada'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
     """
     st.write("### Mapa de Zonas Deforestadas")
 
@@ -64,63 +132,89 @@ def mostrar_mapa_deforestacion(df):
         value=(float(df["Superficie_Deforestada"].min()), float(df["Superficie_Deforestada"].max())),
     )
 
-    # Aplicar filtros
-    filtered_df = df[
-        (df["Latitud"] >= latitud_range[0])
-        & (df["Latitud"] <= latitud_range[1])
-        & (df["Longitud"] >= longitud_range[0])
-        & (df["Longitud"] <= longitud_range[1])
-        & (df["Superficie_Deforestada"] >= superficie_range[0])
-        & (df["Superficie_Deforestada"] <= superficie_range[1])
-    ]
-
-    # Crear el mapa
-    route = (
-        "https://naturalearth.s3.amazonaws.com/50m_cultural/ne_50m_admin_0_countries.zip"
-    )
-    world = gpd.read_file(route)
-    filtered_df["geometry"] = filtered_df.apply(
-        lambda row: Point(row["Longitud"], row["Latitud"]), axis=1
-    )
-    gdf = gpd.GeoDataFrame(filtered_df, geometry="geometry")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    world.plot(ax=ax, color="lightgray")
-    gdf.plot(
-        ax=ax, column="Superficie_Deforestada", legend=True, cmap="Reds", markersize=5
+    # Aplicar filtros como máscara sobre los datos compartidos y copiar solo
+    # las columnas que necesita el mapa
+    rangos = {
+        "Latitud": latitud_range,
+        "Longitud": longitud_range,
+        "Superficie_Deforestada": superficie_range,
+    }
+    columnas = COLUMNAS_MAPA + [columna for columna in ESTRATOS if columna in df.columns]
+    filtered_df = df.loc[mascara_rangos(df, rangos), columnas]
+
+    # La muestra precalculada se filtra igual que los datos
+    if muestra is not None:
+        muestra = muestra.loc[mascara_rangos(muestra, rangos), columnas]
+
+    mostrar_progresivo(figura_mapa_deforestacion, filtered_df, estratos=ESTRATOS, muestra=muestra)
+
+    # Totales por país con los mismos filtros; el país de cada punto se
+    # calcula en segundo plano una sola vez sobre el conjunto completo y cada
+    # posición de los filtros solo lo recorta
+    st.write("### Superficie Deforestada por País")
+    mostrar_progresivo(
+        partial(figura_deforestacion_por_pais, completo=df), filtered_df, estratos=ESTRATOS, muestra=muestra
     )
-    st.pyplot(fig)
 
 
-def clusterizar_deforestacion(df):
-    """Realiza un análisis de clúster sobre las superficies deforestadas.
+def figura_clusteres(df):
+    """Construye el gráfico de clústeres de superficie deforestada.
 
     Args:
         df (pd.DataFrame): DataFrame con columnas 'Latitud', 'Longitud', 'Superficie_Deforestada'.
+
+    Returns:
+        Figure: Figura con los clústeres.
     """
-    st.write("### Análisis de Clúster de Deforestación")
     bins = np.histogram_bin_edges(df["Superficie_Deforestada"], bins=3)
-    df["cluster"] = np.digitize(df["Superficie_Deforestada"], bins=bins)
-    fig, ax = plt.subplots()
-    scatter = ax.scatter(df["Longitud"], df["Latitud"], c=df["cluster"], cmap="viridis")
-    plt.colorbar(scatter, label="Cluster")
+    cluster = np.digitize(df["Superficie_Deforestada"], bins=bins)
+    fig = Figure()
+    ax = fig.subplots()
+    scatter = ax.scatter(df["Longitud"], df["Latitud"], c=cluster, cmap="viridis")
+    fig.colorbar(scatter, ax=ax, label="Cluster")
     ax.set_xlabel("Longitud")
     ax.set_ylabel("Latitud")
     ax.set_title("Clúster de Deforestación")
-    st.pyplot(fig)
+    return fig
 
 
-def grafico_torta_vegetacion(df):
-    """Genera un gráfico de torta según el tipo de vegetación.
+def clusterizar_deforestacion(df, muestra=None):
+    """Realiza un análisis de clúster sobre las superficies deforestadas.
+
+    Args:
+        df (pd.DataFrame): DataFrame con columnas 'Latitud', 'Longitud', 'Superficie_Deforestada'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
+    """
+    st.write("### Análisis de Clúster de Deforestación")
+    mostrar_progresivo(figura_clusteres, df, estratos=ESTRATOS, muestra=muestra)
+
+
+def figura_torta_vegetacion(df):
+    """Construye el gráfico de torta según el tipo de vegetación.
 
     Args:
         df (pd.DataFrame): DataFrame con columna 'Tipo_Vegetacion'.
+
+    Returns:
+        Figure: Figura con la torta.
     """
-    st.write("### Distribución por Tipo de Vegetación")
     tipo_veg = df["Tipo_Vegetacion"].value_counts()
-    fig, ax = plt.subplots()
+    fig = Figure()
+    ax = fig.subplots()
     ax.pie(tipo_veg, labels=tipo_veg.index, autopct="%1.1f%%", startangle=90)
     ax.set_title("Distribución por Tipo de Vegetación")
-    st.pyplot(fig)
+    return fig
+
+
+def grafico_torta_vegetacion(df, muestra=None):
+    """Genera un gráfico de torta según el tipo de vegetación.
+
+    Args:
+        df (pd.DataFrame): DataFrame con columna 'Tipo_Vegetacion'.
+        muestra (pd.DataFrame, optional): Muestra precalculada para la vista previa. Defaults to None.
+    """
+    st.write("### Distribución por Tipo de Vegetación")
+    mostrar_progresivo(figura_torta_vegetacion, df, estratos=ESTRATOS, muestra=muestra)
 
 
 def main():
@@ -133,9 +227,12 @@ def main():
     url = st.sidebar.text_input("O proporciona una URL de un archivo CSV")
 
     # Cargar datos
-    df = cargar_datos(archivo, url)
+    df, extras = cargar_datos(archivo, url)
 
     if df is not None:
+        # Mantener viva la vista mientras dure la sesión
+        st.session_state["datos"] = df
+
         # Menú de opciones en la barra lateral
         opcion = st.sidebar.radio(
             "Selecciona una opción:",
@@ -147,14 +244,16 @@ def main():
             ],
         )
 
-        if opcion == "Estadísticas Generales":
-            mostrar_estadisticas(df)
-        elif opcion == "Mapa de Deforestación":
-            mostrar_mapa_deforestacion(df)
-        elif opcion == "Análisis de Clúster":
-            clusterizar_deforestacion(df)
-        elif opcion == "Gráfico de Vegetación":
-            grafico_torta_vegetacion(df)
+        muestra = extras.get("muestra")
+        with pagina_progresiva():
+            if opcion == "Estadísticas Generales":
+                mostrar_estadisticas(df, extras.get("estadisticas"))
+            elif opcion == "Mapa de Deforestación":
+                mostrar_mapa_deforestacion(df, muestra)
+            elif opcion == "Análisis de Clúster":
+                clusterizar_deforestacion(df, muestra)
+            elif opcion == "Gráfico de Vegetación":
+                grafico_torta_vegetacion(df, muestra)
 
 
 if __name__ == "__main__":